@@ -2,14 +2,23 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from flask import Flask
+from flask import Flask, Response
 import sys
 import os as os_module
 sys.path.insert(0, os_module.path.dirname(os_module.path.dirname(os_module.path.abspath(__file__))))
 from config import Config
-from app.routes import main_bp
+from app.routes import main_bp, upload_store, admission, feedback_metrics, profiler
+from utils import metrics
 
-def create_app():
+def start_background_tasks():
+    """Start threads that must run in every serving process.
+    
+    Under gunicorn with preload these are started per worker after the fork
+    (see gunicorn.conf.py), never in the master.
+    """
+    upload_store.start_janitor(Config.STORAGE_JANITOR_INTERVAL)
+
+def create_app(background_tasks=True):
     app = Flask(__name__)
     app.config.from_object(Config)
     
@@ -19,11 +28,24 @@ def create_app():
     # Register blueprints
     app.register_blueprint(main_bp)
     
+    # Evict old uploads in the background and export storage usage
+    if background_tasks:
+        start_background_tasks()
+    metrics.register('storage', upload_store.stats)
+    metrics.register('admission', admission.stats)
+    metrics.register('feedback', feedback_metrics.stats)
+    metrics.register('profiling', profiler.stats)
+    
     # Add health check endpoint
     @app.route('/health')
     def health_check():
         return {'status': 'healthy', 'service': 'FalsifyX'}
     
+    # Prometheus-style metrics endpoint
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+    
     return app
 
 if __name__ == '__main__':
@@ -1,19 +1,82 @@
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, flash
+from flask import Blueprint, Response, render_template, request, jsonify, session, redirect, url_for, flash, stream_with_context
+from markupsafe import escape
 from werkzeug.utils import secure_filename
 from werkzeug.security import check_password_hash, generate_password_hash
 import os
 import time
 import json
 import hashlib
+import uuid
 from config import Config
-from utils.file_utils import allowed_file
+from utils.file_utils import allowed_file, get_media_type
+from utils.admission import AdmissionController, AdmissionRejected
+from utils.chunked_upload import ChunkedUploadManager, ChunkedUploadError
+from utils.storage import ContentStore
+from utils.evaluation import FeedbackMetrics
+from utils.learning_index import LearningIndex
+from utils.profiling import RequestProfiler
+from detection.video_processing import AdaptiveFrameScheduler
+from detection.fusion import fuse_modalities
+from utils.image_utils import ImageTooLarge, load_image
+from utils.video_utils import FrameBuffer, extract_audio_track, list_keyframes, probe_video, read_frames_seek
+from utils.serialization import (
+    ROW_FORMAT, dumps_compact, encode, negotiate_format, video_results_to_columnar
+)
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 
 main_bp = Blueprint('main', __name__)
 
 # Simple in-memory user storage (in production, use a database)
 users = {}
 
+# Resumable upload sessions, assembled under TEMP_FOLDER
+chunked_uploads = ChunkedUploadManager(
+    os.path.join(Config.TEMP_FOLDER, 'chunked'),
+    chunk_size=Config.UPLOAD_CHUNK_SIZE,
+    max_size=Config.MAX_CHUNKED_UPLOAD_SIZE,
+    session_ttl=Config.UPLOAD_SESSION_TTL,
+    max_sessions_per_user=Config.MAX_UPLOAD_SESSIONS_PER_USER
+)
+
+# Separate pools so the visual and audio branches of a video job run side by side
+visual_executor = ThreadPoolExecutor(max_workers=Config.VISUAL_WORKERS, thread_name_prefix='visual')
+audio_executor = ThreadPoolExecutor(max_workers=Config.AUDIO_WORKERS, thread_name_prefix='audio')
+
+# Bounded admission for analysis jobs: per-type concurrency, per-user quotas
+admission = AdmissionController(
+    Config.ADMISSION_CONCURRENCY,
+    max_queue=Config.ADMISSION_MAX_QUEUE,
+    queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT,
+    user_rate=Config.USER_UPLOAD_RATE,
+    user_burst=Config.USER_UPLOAD_BURST
+)
+
+# Uploads are stored by content hash and evicted by the storage janitor
+upload_store = ContentStore(
+    Config.STORAGE_FOLDER,
+    max_age=Config.STORAGE_MAX_AGE,
+    max_bytes=Config.STORAGE_MAX_BYTES
+)
+
+# Accuracy and calibration metrics, updated incrementally from the feedback log
+feedback_metrics = FeedbackMetrics(
+    os.path.join(Config.UPLOAD_FOLDER, 'user_feedback.jsonl'),
+    state_path=os.path.join(Config.UPLOAD_FOLDER, 'feedback_metrics.json'),
+    bins=Config.FEEDBACK_CALIBRATION_BINS
+)
+
+# Newest-first index of the learning database for the /debug_learning admin page
+learning_index = LearningIndex(os.path.join(Config.UPLOAD_FOLDER, 'learning_database.json'))
+
+# Opt-in cProfile capture of analysis jobs (X-Profile header, admin toggle or sampling)
+profiler = RequestProfiler(
+    Config.PROFILE_FOLDER,
+    sample_rate=Config.PROFILE_SAMPLE_RATE,
+    keep_slowest=Config.PROFILE_KEEP_SLOWEST,
+    keep_requested=Config.PROFILE_KEEP_REQUESTED
+)
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -22,6 +85,19 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def is_admin():
+    return session.get('user_id') in Config.ADMIN_USERS
+
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            return redirect(url_for('main.login'))
+        if not is_admin():
+            return jsonify({'error': 'Admin access required'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
 @main_bp.route('/')
 def index():
     print(f"Session data: {dict(session)}")  # Debug print
@@ -103,6 +179,7 @@ def test_learning():
         learning_file = os.path.join(Config.UPLOAD_FOLDER, 'learning_database.json')
         
         if os.path.exists(learning_file):
+            previous_signature = learning_index.signature()
             with open(learning_file, 'r') as f:
                 learning_db = json.load(f)
             
@@ -117,7 +194,8 @@ def test_learning():
                 }
                 
                 with open(learning_file, 'w') as f:
-                    json.dump(learning_db, f, indent=2)
+                    f.write(dumps_compact(learning_db))
+                learning_index.apply({key: learning_db[key]}, previous_signature)
         
         # Test retrieval
         learned = get_learned_result(test_hash, 'image')
@@ -143,52 +221,113 @@ def test_learning():
     except Exception as e:
         return f'<h1>Error</h1><p>{str(e)}</p>'
 
+DEBUG_LEARNING_STYLE = '<style>body{font-family:Arial,sans-serif;background:#0a0a0f;color:#fff;} a{color:#00d4ff;} .entry{border:1px solid #2d3748;margin:10px;padding:15px;background:#1a1a2e;border-radius:8px;} .learned{border-left:4px solid #4ecdc4;} .pending{border-left:4px solid #ffe66d;}</style>'
+
+def parse_time_arg(value):
+    """Epoch seconds from a query argument given as epoch seconds or an ISO date/time"""
+    from datetime import datetime
+    
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def render_learning_entry(record, learned):
+    """HTML for one learning database entry"""
+    data = {k: escape(v) if isinstance(v, str) else v for k, v in record.items()}
+    html = f'<div class="entry {"learned" if learned else "pending"}">'
+    html += f'<h3>🔑 {data["key"]}</h3>'
+    
+    if not record['lookup']:
+        html += f'<p><strong>Filename:</strong> {data["filename"] or "N/A"}</p>'
+        html += f'<p><strong>Type:</strong> {data["media_type"] or "N/A"}</p>'
+        html += f'<p><strong>Hash:</strong> {(data["file_hash"] or "N/A")[:16]}...</p>'
+        html += f'<p><strong>Analysis ID:</strong> {data["analysis_id"] or "N/A"}</p>'
+        
+        if 'learned_result' in record:
+            lr = record['learned_result']
+            html += f'<p style="color: #4ecdc4;"><strong>LEARNED:</strong> {"FAKE" if lr.get("is_fake") else "AUTHENTIC"} (confidence: {lr.get("confidence", 0):.2f})</p>'
+            html += f'<p><strong>Learned at:</strong> {time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(lr.get("feedback_timestamp", 0)))}</p>'
+        else:
+            html += f'<p style="color: #ffe66d;"><strong>Status:</strong> No learning data yet</p>'
+    else:
+        # Analysis lookup entry
+        html += f'<p><strong>Hash Key:</strong> {data["hash_key"] or "N/A"}</p>'
+        html += f'<p><strong>Filename:</strong> {data["filename"] or "N/A"}</p>'
+    
+    html += '</div>'
+    return html
+
 @main_bp.route('/debug_learning')
 @login_required
 def debug_learning():
-    """Debug endpoint to check learning database"""
+    """Debug endpoint to browse the learning database, paginated and filterable.
+    
+    Query arguments: media_type, status (learned|pending), since/until
+    (epoch seconds or ISO date), page and per_page.
+    """
     try:
-        import json
-        learning_file = os.path.join(Config.UPLOAD_FOLDER, 'learning_database.json')
-        
-        if os.path.exists(learning_file):
-            with open(learning_file, 'r') as f:
-                learning_db = json.load(f)
-            
-            html = '<h1>FalsifyX Learning Database</h1>'
-            html += f'<p>Total entries: {len(learning_db)}</p>'
-            html += '<style>body{font-family:Arial,sans-serif;background:#0a0a0f;color:#fff;} .entry{border:1px solid #2d3748;margin:10px;padding:15px;background:#1a1a2e;border-radius:8px;} .learned{border-left:4px solid #4ecdc4;} .pending{border-left:4px solid #ffe66d;}</style>'
-            
-            for key, data in learning_db.items():
-                entry_class = 'learned' if 'learned_result' in data else 'pending'
-                html += f'<div class="entry {entry_class}">'
-                html += f'<h3>🔑 {key}</h3>'
-                
-                if not key.startswith('analysis_'):
-                    html += f'<p><strong>Filename:</strong> {data.get("filename", "N/A")}</p>'
-                    html += f'<p><strong>Type:</strong> {data.get("media_type", "N/A")}</p>'
-                    html += f'<p><strong>Hash:</strong> {data.get("file_hash", "N/A")[:16]}...</p>'
-                    html += f'<p><strong>Analysis ID:</strong> {data.get("analysis_id", "N/A")}</p>'
-                    
-                    if 'learned_result' in data:
-                        lr = data['learned_result']
-                        html += f'<p style="color: #4ecdc4;"><strong>LEARNED:</strong> {"FAKE" if lr.get("is_fake") else "AUTHENTIC"} (confidence: {lr.get("confidence", 0):.2f})</p>'
-                        html += f'<p><strong>Learned at:</strong> {time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(lr.get("feedback_timestamp", 0)))}</p>'
-                    else:
-                        html += f'<p style="color: #ffe66d;"><strong>Status:</strong> No learning data yet</p>'
-                else:
-                    # Analysis lookup entry
-                    html += f'<p><strong>Hash Key:</strong> {data.get("hash_key", "N/A")}</p>'
-                    html += f'<p><strong>Filename:</strong> {data.get("filename", "N/A")}</p>'
-                
-                html += '</div>'
-            
-            return html
-        else:
+        filters = {
+            'media_type': request.args.get('media_type') or None,
+            'status': request.args.get('status') or None,
+            'since': parse_time_arg(request.args.get('since')),
+            'until': parse_time_arg(request.args.get('until'))
+        }
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', Config.DEBUG_LEARNING_PAGE_SIZE, type=int), 1), 500)
+    except ValueError as e:
+        return f'<h1>Error</h1><p>Invalid filter: {escape(str(e))}</p>', 400
+    
+    # The database file is rewritten in place on every change, so a read can
+    # catch it half-written. The index then keeps serving its last good
+    # version; only before the first successful load is there nothing to show.
+    try:
+        if not learning_index.refresh():
             return '<h1>Learning Database</h1><p>No learning database found yet. Upload and analyze some files first!</p>'
+    except (OSError, ValueError) as e:
+        print(f"Could not load learning database: {e}")
+        return ('<h1>Error</h1><p>The learning database is being updated, please retry shortly.</p>',
+                503, {'Retry-After': '1'})
     
-    except Exception as e:
-        return f'<h1>Error</h1><p>{str(e)}</p>'
+    total, records, learned = learning_index.query(offset=(page - 1) * per_page, limit=per_page, **filters)
+    counts = learning_index.counts()
+    pages = max((total + per_page - 1) // per_page, 1)
+    
+    def page_link(number, label):
+        args = {k: v for k, v in request.args.items() if k != 'page'}
+        args['page'] = number
+        return f'<a href="{url_for("main.debug_learning", **args)}">{label}</a>'
+    
+    def generate():
+        yield '<h1>FalsifyX Learning Database</h1>' + DEBUG_LEARNING_STYLE
+        yield (f'<p>Total entries: {counts["total"]} ({counts["learned"]} learned, {counts["pending"]} pending)'
+               f' &middot; {total} matching &middot; page {page} of {pages}</p>')
+        yield (
+            '<form method="get">'
+            '<select name="media_type"><option value="">all types</option>'
+            + ''.join(f'<option{" selected" if filters["media_type"] == t else ""}>{t}</option>' for t in ('image', 'video', 'audio'))
+            + '</select> '
+            '<select name="status"><option value="">any status</option>'
+            + ''.join(f'<option{" selected" if filters["status"] == s else ""}>{s}</option>' for s in ('learned', 'pending'))
+            + '</select> '
+            f'since <input name="since" placeholder="YYYY-MM-DD" value="{escape(request.args.get("since", ""))}"> '
+            f'until <input name="until" placeholder="YYYY-MM-DD" value="{escape(request.args.get("until", ""))}"> '
+            f'<input type="hidden" name="per_page" value="{per_page}">'
+            '<button type="submit">Filter</button></form>'
+        )
+        for record, is_learned in zip(records, learned):
+            yield render_learning_entry(record, is_learned)
+        
+        nav = []
+        if page > 1:
+            nav.append(page_link(page - 1, '&larr; Newer'))
+        if page < pages:
+            nav.append(page_link(page + 1, 'Older &rarr;'))
+        yield f'<p>{" | ".join(nav)}</p>'
+    
+    return Response(stream_with_context(generate()), mimetype='text/html')
 
 @main_bp.route('/feedback', methods=['POST'])
 @login_required
@@ -225,9 +364,12 @@ def receive_feedback():
         import json
         import os
         
-        feedback_file = os.path.join(Config.UPLOAD_FOLDER, 'user_feedback.jsonl')
+        feedback_file = feedback_metrics.log_path
         os.makedirs(os.path.dirname(feedback_file), exist_ok=True)
         
+        # Metrics are grouped by the model that made the prediction
+        feedback_data.setdefault('modelVersion', Config.MODEL_VERSION)
+        
         with open(feedback_file, 'a') as f:
             f.write(json.dumps(feedback_data) + '\n')
         
@@ -240,6 +382,64 @@ def receive_feedback():
         print(f"Error processing feedback: {e}")
         return jsonify({'error': 'Failed to process feedback'}), 500
 
+@main_bp.route('/feedback/metrics')
+@login_required
+def feedback_metrics_summary():
+    """Accuracy, precision/recall and calibration from user feedback, per media type and model version"""
+    added = feedback_metrics.update()
+    if added:
+        print(f"Feedback metrics: {added} new records")
+    return jsonify(feedback_metrics.summary(
+        media_type=request.args.get('media_type'),
+        model_version=request.args.get('model_version')
+    ))
+
+@main_bp.route('/admin/profiling', methods=['GET', 'POST'])
+@admin_required
+def profiling_settings():
+    """Show or change the profiling toggle and sampling rate (shared by all workers)"""
+    if request.method == 'GET':
+        return jsonify(profiler.status())
+    
+    settings = request.get_json(silent=True) or {}
+    enabled = settings.get('enabled', False)
+    # bool("false") is True, so only accept real JSON booleans
+    if not isinstance(enabled, bool):
+        return jsonify({'error': 'enabled must be true or false'}), 400
+    try:
+        status = profiler.set_toggle(
+            enabled,
+            minutes=settings.get('minutes', 10),
+            sample_rate=settings.get('sample_rate')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    print(f"Profiling settings changed by {session['user_id']}: {status}")
+    return jsonify(status)
+
+@main_bp.route('/admin/profiles')
+@admin_required
+def list_profiles():
+    """Stored profiles, slowest first"""
+    return jsonify({'status': profiler.status(), 'profiles': profiler.list_profiles()})
+
+@main_bp.route('/admin/profiles/<profile_id>')
+@admin_required
+def get_profile(profile_id):
+    """Text summary of one profile, or the raw .prof file with ?download=1"""
+    from flask import send_file
+    
+    profile = profiler.get_profile(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    meta, prof_path = profile
+    
+    if request.args.get('download'):
+        return send_file(prof_path, as_attachment=True, download_name=f'{profile_id}.prof')
+    
+    header = f"{meta['name']} {meta.get('filename', '')} - {meta['duration_ms']} ms ({meta['reason']}, pid {meta['pid']}, {meta.get('threads', 1)} threads)\n\n"
+    return Response(header + meta['summary'], mimetype='text/plain')
+
 # Learning System Helper Functions
 def calculate_file_hash(filepath):
     """Calculate SHA-256 hash of a file for learning system"""
@@ -293,6 +493,7 @@ def store_analysis_hash(file_hash, filename, media_type, results, analysis_id=No
         
         # Load existing database
         learning_db = {}
+        previous_signature = learning_index.signature()
         if os.path.exists(learning_file):
             with open(learning_file, 'r') as f:
                 learning_db = json.load(f)
@@ -321,7 +522,9 @@ def store_analysis_hash(file_hash, filename, media_type, results, analysis_id=No
         
         # Save database
         with open(learning_file, 'w') as f:
-            json.dump(learning_db, f, indent=2)
+            f.write(dumps_compact(learning_db))
+        changed = [key, f"analysis_{analysis_id}"] if analysis_id else [key]
+        learning_index.apply({k: learning_db[k] for k in changed}, previous_signature)
         
         print(f"Stored analysis hash: {key} with analysis_id: {analysis_id}")
     except Exception as e:
@@ -356,6 +559,7 @@ def update_learning():
             learning_file = os.path.join(Config.UPLOAD_FOLDER, 'learning_database.json')
             
             if os.path.exists(learning_file):
+                previous_signature = learning_index.signature()
                 with open(learning_file, 'r') as f:
                     learning_db = json.load(f)
                 
@@ -424,7 +628,8 @@ def update_learning():
                     
                     # Save updated database
                     with open(learning_file, 'w') as f:
-                        json.dump(learning_db, f, indent=2)
+                        f.write(dumps_compact(learning_db))
+                    learning_index.apply({matching_key: learning_db[matching_key]}, previous_signature)
                     
                     return jsonify({
                         'status': 'success', 
@@ -458,44 +663,211 @@ def update_learning():
 @main_bp.route('/upload', methods=['POST'])
 @login_required
 def upload_file():
+    """Receive a single-request upload and analyze it.
+    
+    The job is admitted before the multipart body is read, so a burst of
+    large uploads cannot take every server thread. Clients name the file in
+    an X-Upload-Filename header (or ?filename=) so the slot for its media
+    type can be taken up front; without it the body is received under the
+    shared 'upload' limit and the media type slot is taken afterwards.
+    """
+    from urllib.parse import unquote
+    
     print(f"Upload request received")
+    user_id = session['user_id']
+    hinted_name = secure_filename(unquote(request.headers.get('X-Upload-Filename') or request.args.get('filename', '')))
+    media_type = get_media_type(hinted_name) if hinted_name else None
+    if hinted_name and media_type is None:
+        print(f"Invalid file type: {hinted_name}")
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    temp_path = None
+    try:
+        if media_type:
+            with admission.admit(media_type, user_id):
+                temp_path, filename, error = save_request_file()
+                if error:
+                    return error
+                if get_media_type(filename) != media_type:
+                    os.remove(temp_path)
+                    return jsonify({'error': 'File name does not match X-Upload-Filename'}), 400
+                return store_and_analyze(temp_path, filename)
+        
+        with admission.admit('upload', user_id):
+            temp_path, filename, error = save_request_file()
+        if error:
+            return error
+        # The quota was charged for the transfer above
+        return analyze_stored_upload(temp_path, filename, quota_cost=0)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e, temp_path)
+
+def save_request_file():
+    """Save the multipart 'file' field to TEMP_FOLDER as (temp_path, filename, error_response)"""
     print(f"Files in request: {list(request.files.keys())}")
     
     if 'file' not in request.files:
         print("No file part in request")
-        return jsonify({'error': 'No file part'}), 400
+        return None, None, (jsonify({'error': 'No file part'}), 400)
         
     file = request.files['file']
     print(f"File received: {file.filename}")
     
     if file.filename == '':
         print("No file selected")
-        return jsonify({'error': 'No selected file'}), 400
-        
-    if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(Config.UPLOAD_FOLDER, filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        file.save(filepath)
-        print(f"File saved to: {filepath}")
-        
-        # Process based on file type
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+        return None, None, (jsonify({'error': 'No selected file'}), 400)
+    
+    filename = secure_filename(file.filename)
+    if not allowed_file(filename) or get_media_type(filename) is None:
+        print(f"Invalid file type: {file.filename}")
+        return None, None, (jsonify({'error': 'Invalid file type'}), 400)
+    
+    temp_path = os.path.join(Config.TEMP_FOLDER, f"{uuid.uuid4().hex}_{filename}")
+    os.makedirs(os.path.dirname(temp_path), exist_ok=True)
+    file.save(temp_path)
+    return temp_path, filename, None
+
+def admission_rejected_response(e, temp_path=None):
+    """429/503 with Retry-After for a refused job; drops its temporary file"""
+    print(f"Upload rejected ({e.status}): {e.message}, retry after {e.retry_after}s")
+    if temp_path and os.path.exists(temp_path):
+        os.remove(temp_path)
+    return jsonify({'error': e.message}), e.status, {'Retry-After': str(e.retry_after)}
+
+def analyze_stored_upload(temp_path, filename, file_hash=None, quota_cost=1):
+    """Admit an already received upload, then store and analyze it"""
+    media_type = get_media_type(filename)
+    if media_type is None:
+        print(f"Invalid file type: {filename}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    try:
+        with admission.admit(media_type, session['user_id'], cost=quota_cost):
+            return store_and_analyze(temp_path, filename, file_hash)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e, temp_path)
+
+def store_and_analyze(temp_path, filename, file_hash=None):
+    """Move an upload into content-addressed storage and analyze it"""
+    extension = filename.rsplit('.', 1)[1].lower()
+    filepath, file_hash = upload_store.put(temp_path, extension, file_hash)
+    print(f"File saved to: {filepath}")
+    
+    try:
+        return analyze_upload(filepath, filename, file_hash)
+    finally:
+        upload_store.release(filepath)
+
+def analyze_upload(filepath, filename, file_hash=None):
+    """Dispatch a saved upload to the analyzer for its media type"""
+    media_type = get_media_type(filename)
+    if media_type not in ('image', 'video', 'audio'):
+        print(f"Invalid file type: {filename}")
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    # Admins can ask for a profile of this job with the X-Profile header
+    requested = is_admin() and request.headers.get('X-Profile', '').lower() in ('1', 'true', 'yes')
+    with profiler.profile(media_type, {'filename': filename, 'user': session.get('user_id')}, requested=requested):
+        if media_type == 'image':
             print("Processing image file")
-            return process_image(filepath, filename)
+            return process_image(filepath, filename, file_hash)
             
-        elif filename.lower().endswith(('.mp4', '.avi', '.mov', '.webm')):
+        elif media_type == 'video':
             print("Processing video file")
-            return process_video(filepath, filename)
+            return process_video(
+                filepath, filename, file_hash,
+                frame_budget=request.values.get('frame_budget', type=int),
+                time_budget_ms=request.values.get('time_budget_ms', type=int)
+            )
             
-        elif filename.lower().endswith(('.mp3', '.wav', '.ogg')):
+        else:
             print("Processing audio file")
-            return process_audio(filepath, filename)
+            return process_audio(filepath, filename, file_hash)
+
+@main_bp.route('/upload/init', methods=['POST'])
+@login_required
+def init_chunked_upload():
+    """Start a resumable upload; the client then PUTs chunks by index"""
+    upload_data = request.get_json(silent=True) or {}
+    filename = upload_data.get('filename', '')
+    
+    if not filename or not allowed_file(filename) or get_media_type(secure_filename(filename)) is None:
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    try:
+        # The whole upload is charged to the user's quota here, before any bytes arrive
+        admission.check_quota(session['user_id'])
+        status = chunked_uploads.init_upload(
+            secure_filename(filename),
+            upload_data.get('size'),
+            session['user_id'],
+            chunk_size=upload_data.get('chunkSize')
+        )
+        return jsonify(status), 201
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except ChunkedUploadError as e:
+        return jsonify({'error': e.message}), e.status
+
+@main_bp.route('/upload/<upload_id>', methods=['GET'])
+@login_required
+def chunked_upload_status(upload_id):
+    """Report which chunks have landed so an interrupted client can resume"""
+    try:
+        return jsonify(chunked_uploads.get_status(upload_id, session['user_id']))
+    except ChunkedUploadError as e:
+        return jsonify({'error': e.message}), e.status
+
+@main_bp.route('/upload/<upload_id>/chunk/<int:index>', methods=['PUT'])
+@login_required
+def upload_chunk(upload_id, index):
+    """Store one chunk; the body is raw bytes, X-Chunk-SHA256 its checksum"""
+    try:
+        # Chunk bodies hold a thread while they arrive, so they share the 'upload' limit
+        with admission.admit('upload', session['user_id'], cost=Config.UPLOAD_CHUNK_QUOTA_COST):
+            status = chunked_uploads.write_chunk(
+                upload_id,
+                index,
+                request.get_data(cache=False),
+                request.headers.get('X-Chunk-SHA256'),
+                session['user_id']
+            )
+        return jsonify(status)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except ChunkedUploadError as e:
+        return jsonify({'error': e.message}), e.status
+
+@main_bp.route('/upload/<upload_id>/complete', methods=['POST'])
+@login_required
+def complete_chunked_upload(upload_id):
+    """Verify the assembled file and run the same analysis as /upload"""
+    upload_data = request.get_json(silent=True) or {}
+    
+    try:
+        filename = chunked_uploads.get_status(upload_id, session['user_id'])['filename']
+    except ChunkedUploadError as e:
+        return jsonify({'error': e.message}), e.status
+    
+    try:
+        # Quota was charged at /upload/init; a refused job keeps its session so the client can retry
+        with admission.admit(get_media_type(filename), session['user_id'], cost=0):
+            try:
+                data_path, filename, file_hash = chunked_uploads.complete(
+                    upload_id, session['user_id'], upload_data.get('sha256'))
+            except ChunkedUploadError as e:
+                return jsonify({'error': e.message}), e.status
             
-    print(f"Invalid file type: {file.filename}")
-    return jsonify({'error': 'Invalid file type'}), 400
+            try:
+                return store_and_analyze(data_path, filename, file_hash)
+            finally:
+                chunked_uploads.discard(upload_id)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
 
-def process_image(filepath, filename):
+def process_image(filepath, filename, file_hash=None):
     """Process image file for deepfake and AI-generated content detection"""
     import random
     import time
@@ -512,18 +884,34 @@ def process_image(filepath, filename):
     # Generate unique analysis ID
     analysis_id = str(int(time.time() * 1000))  # Timestamp-based ID
     
-    # Calculate file hash for learning system
-    file_hash = calculate_file_hash(filepath)
+    # Decode at reduced resolution; oversized images are rejected from the header
+    try:
+        image, image_info = load_image(filepath, Config.IMAGE_ANALYSIS_MAX_SIDE, Config.IMAGE_MAX_PIXELS)
+    except ImageTooLarge as e:
+        print(f"Rejected image: {e}")
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        print(f"Could not decode image: {e}")
+        return jsonify({'error': 'Could not decode image'}), 400
+    print(f"   - Decoded {image_info['width']}x{image_info['height']} at 1/{image_info['reduction_factor']} scale")
+    
+    # Calculate file hash for learning system (chunked uploads hash as they arrive)
+    file_hash = file_hash or calculate_file_hash(filepath)
     
     # Check if we have previous feedback for this file
     learned_result = get_learned_result(file_hash, 'image')
     
+    # Face verdicts from the batched face model, when one is deployed
+    model_faces = None if learned_result else predict_faces(image)
+    
     # Simulate processing time for comprehensive analysis
     time.sleep(3)
     
     # Enhanced analysis results with AI generation detection
     results = []
     num_faces = random.randint(0, 3)  # Can have 0 faces for AI-generated landscapes, etc.
+    if model_faces is not None:
+        num_faces = len(model_faces)
     
     # Overall image AI generation indicators
     image_ai_indicators = {
@@ -555,9 +943,12 @@ def process_image(filepath, filename):
         if num_faces > 0:
             # Face-based analysis
             for i in range(num_faces):
-                is_fake = random.choice([True, False])
+                if model_faces is not None:
+                    is_fake, confidence = model_faces[i]['is_fake'], model_faces[i]['confidence']
+                else:
+                    is_fake = random.choice([True, False])
+                    confidence = random.uniform(0.6, 0.95) if is_fake else random.uniform(0.7, 0.98)
                 ai_generated = random.choice([True, False])
-                confidence = random.uniform(0.6, 0.95) if is_fake else random.uniform(0.7, 0.98)
                 ai_confidence = random.uniform(0.5, 0.95)
                 
                 results.append({
@@ -604,7 +995,9 @@ def process_image(filepath, filename):
             'frequency_domain_analysis': image_ai_indicators['frequency_analysis'],
             'noise_pattern_score': image_ai_indicators['noise_pattern'],
             'detected_generation_method': image_ai_indicators['generation_method'],
-            'overall_authenticity': 'SUSPICIOUS' if image_ai_indicators['ai_generation_score'] > 0.7 else 'LIKELY_AUTHENTIC'
+            'overall_authenticity': 'SUSPICIOUS' if image_ai_indicators['ai_generation_score'] > 0.7 else 'LIKELY_AUTHENTIC',
+            'resolution': [image_info['width'], image_info['height']],
+            'analysis_resolution': [image_info['decoded_width'], image_info['decoded_height']]
         }
     }
     
@@ -626,11 +1019,9 @@ def process_image(filepath, filename):
     
     return jsonify({'results': results, 'analysis_id': analysis_id})
 
-def process_video(filepath, filename):
+def process_video(filepath, filename, file_hash=None, frame_budget=None, time_budget_ms=None):
     """Process video file for deepfake and AI-generated content detection"""
-    import random
     import time
-    import hashlib
     
     print(f"Analyzing video: {filename}")
     print("Running comprehensive video analysis...")
@@ -638,22 +1029,100 @@ def process_video(filepath, filename):
     print("   - AI-generated content detection")
     print("   - Temporal consistency analysis")
     print("   - Blink pattern analysis")
+    print("   - Voice cloning detection (audio track)")
     
     # Generate unique analysis ID
     analysis_id = str(int(time.time() * 1000))  # Timestamp-based ID
     
-    # Calculate file hash for learning system
-    file_hash = calculate_file_hash(filepath)
+    # Calculate file hash for learning system (chunked uploads hash as they arrive)
+    file_hash = file_hash or calculate_file_hash(filepath)
     
     # Check if we have previous feedback for this file
     learned_result = get_learned_result(file_hash, 'video')
     
+    # Visual frames and the demuxed audio track are analyzed concurrently,
+    # so latency is roughly that of the slower branch rather than the sum
+    start = time.perf_counter()
+    # wrap() profiles each branch on its executor thread when this job is profiled
+    visual_future = visual_executor.submit(
+        profiler.wrap(timed_call), analyze_video_frames, filepath, learned_result, frame_budget, time_budget_ms)
+    audio_future = audio_executor.submit(
+        profiler.wrap(timed_call), analyze_video_audio_track, filepath, learned_result)
+    
+    results, visual_ms = visual_future.result()
+    try:
+        audio_results, audio_ms = audio_future.result()
+    except Exception as e:
+        print(f"Audio track analysis failed: {e}")
+        audio_results, audio_ms = None, None
+    
+    visual_score = results[-1]['video_summary']['sampling']['mean_fake_score'] \
+        if results[-1]['video_summary']['sampling']['frames_with_evidence'] else None
+    audio_score = audio_fake_score(audio_results['audio']) if audio_results else None
+    
+    fused = fuse_modalities(
+        {'visual': visual_score, 'audio': audio_score},
+        {'visual': Config.VISUAL_FUSION_WEIGHT, 'audio': Config.AUDIO_FUSION_WEIGHT}
+    )
+    fused['audio_track_present'] = audio_results is not None
+    fused['latency_ms'] = {
+        'visual': visual_ms,
+        'audio': audio_ms,
+        'total': (time.perf_counter() - start) * 1000
+    }
+    
+    if audio_results:
+        results.append({'audio_track': audio_results})
+    results.append({'multimodal_summary': fused})
+    
+    # Store file hash for future learning (columnar: per-frame keys are not repeated)
+    store_analysis_hash(file_hash, filename, 'video', video_results_to_columnar(results), analysis_id)
+    
+    frames = [r for r in results if 'frame' in r]
+    ai_frames = sum(1 for frame in frames if isinstance(frame.get('ai_generated'), dict) and frame.get('ai_generated', {}).get('is_ai_generated', False))
+    fake_frames = sum(1 for frame in frames if any(face.get('is_fake', False) for face in frame.get('face', [])))
+    sampling_report = next(r['video_summary']['sampling'] for r in results if 'video_summary' in r)
+    
+    print(f"Video analysis complete:")
+    print(f"   - Frames analyzed: {len(frames)} of {sampling_report['total_frames']} ({sampling_report['stop_reason']})")
+    print(f"   - AI-generated frames detected: {ai_frames}")
+    print(f"   - Deepfake frames detected: {fake_frames}")
+    print(f"   - Audio track: {'analyzed' if audio_results else 'not available'}")
+    print(f"   - Fused verdict: {fused['verdict']} ({fused['latency_ms']['total']:.0f} ms)")
+    
+    return video_results_response(results, analysis_id)
+
+def timed_call(fn, *args):
+    """Run fn(*args) and return (result, elapsed milliseconds)"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def analyze_video_frames(filepath, learned_result=None, frame_budget=None, time_budget_ms=None):
+    """Visual branch of video analysis: sampled frames followed by a video summary"""
+    import random
+    
     # Simulate processing time for comprehensive analysis
     time.sleep(4)
     
-    # Mock analysis results for multiple frames with AI detection
-    results = []
-    num_frames = random.randint(8, 20)  # More frames for better AI detection
+    # Pick frames adaptively: clear-cut videos stop early, uncertain ones get denser sampling
+    # (frame count and keyframes come from container metadata, nothing is decoded)
+    try:
+        video_info = probe_video(filepath)
+        total_frames = video_info['frame_count']
+        keyframes = [index for index, _ in list_keyframes(filepath, video_info['fps'], video_info['start_time'])]
+    except Exception as e:
+        print(f"Could not read video metadata: {e}")
+        video_info, total_frames, keyframes = None, 0, []
+    
+    scheduler = AdaptiveFrameScheduler(
+        total_frames or Config.VIDEO_DEFAULT_FRAME_COUNT,
+        base_frames=Config.VIDEO_BASE_FRAMES,
+        max_frames=min(frame_budget or Config.VIDEO_MAX_FRAMES, Config.VIDEO_MAX_FRAMES),
+        time_budget_ms=min(time_budget_ms or Config.VIDEO_TIME_BUDGET_MS, Config.VIDEO_TIME_BUDGET_MS),
+        z_score=Config.VIDEO_CONFIDENCE_Z,
+        keyframes=keyframes
+    )
     
     # Overall video AI generation indicators
     video_ai_indicators = {
@@ -664,73 +1133,18 @@ def process_video(filepath, filename):
         'ai_generation_score': random.uniform(0.3, 0.95)
     }
     
-    for frame_num in range(1, num_frames + 1):
-        frame_results = {
-            'frame': frame_num * 5,
-            'face': [],
-            'blink': None,
-            'ai_generated': None,
-            'temporal_analysis': None
-        }
-        
-        # Add face detection results
-        num_faces = random.randint(0, 2)
-        for face_id in range(num_faces):
-            if learned_result:
-                # Use learned result
-                is_fake = learned_result['is_fake']
-                confidence = random.uniform(0.85, 0.98)
-                learned = True
-                ai_generated = is_fake  # If learned as fake, likely AI generated
-            else:
-                # Enhanced detection for AI-generated content
-                is_fake = random.choice([True, False])
-                confidence = random.uniform(0.6, 0.95) if is_fake else random.uniform(0.7, 0.98)
-                learned = False
-                ai_generated = random.choice([True, False])
-            
-            face_result = {
-                'is_fake': is_fake,
-                'confidence': confidence,
-                'face_id': face_id + 1,
-                'learned': learned,
-                'ai_generated': ai_generated,
-                'face_quality_score': random.uniform(0.4, 0.95),
-                'edge_consistency': random.uniform(0.3, 0.9),
-                'skin_texture_analysis': random.uniform(0.2, 0.8)
-            }
-            
-            frame_results['face'].append(face_result)
-        
-        # Add AI-generated content analysis
-        if num_faces > 0:
-            frame_results['ai_generated'] = {
-                'is_ai_generated': random.choice([True, False]),
-                'ai_confidence': random.uniform(0.5, 0.95),
-                'generation_method': random.choice(['GAN', 'Diffusion', 'VAE', 'Unknown']),
-                'artifacts_detected': random.choice([True, False]),
-                'pixel_inconsistency': random.uniform(0.1, 0.8),
-                'frequency_analysis': random.uniform(0.2, 0.9)
-            }
-        
-        # Add temporal analysis for AI detection
-        frame_results['temporal_analysis'] = {
-            'motion_consistency': random.uniform(0.3, 0.95),
-            'frame_interpolation_artifacts': random.uniform(0.1, 0.7),
-            'temporal_smoothness': random.uniform(0.4, 0.9),
-            'scene_transition_analysis': random.uniform(0.2, 0.8)
-        }
-        
-        # Add blink analysis
-        if num_faces > 0:
-            frame_results['blink'] = {
-                'is_blinking': random.choice([True, False]),
-                'ear': random.uniform(0.15, 0.35),
-                'blink_frequency': random.uniform(0.1, 0.4),
-                'natural_blink_pattern': random.choice([True, False])
-            }
-        
-        results.append(frame_results)
+    # Frames are only decoded when a face model is deployed to look at them
+    frame_buffer = FrameBuffer() if face_model_available() and not learned_result else None
+    
+    def score_frame(frame_index):
+        model_faces = None
+        if frame_buffer is not None:
+            read, frames = read_frames_seek(filepath, [frame_index], frame_buffer, info=video_info)
+            model_faces = predict_faces(frames[0]) if read else None
+        frame_results = analyze_video_frame(frame_index, learned_result, model_faces)
+        return frame_results, frame_fake_score(frame_results)
+    
+    results, sampling_report = scheduler.run(score_frame)
     
     # Add overall video analysis summary
     overall_analysis = {
@@ -744,31 +1158,161 @@ def process_video(filepath, filename):
             'compression_analysis': video_ai_indicators['compression_artifacts'],
             'motion_analysis': video_ai_indicators['motion_blur_patterns'],
             'lighting_analysis': video_ai_indicators['lighting_inconsistency'],
-            'recommendation': 'SUSPICIOUS' if video_ai_indicators['ai_generation_score'] > 0.7 else 'LIKELY_AUTHENTIC'
+            'recommendation': 'SUSPICIOUS' if video_ai_indicators['ai_generation_score'] > 0.7 else 'LIKELY_AUTHENTIC',
+            'sampling': sampling_report
         }
     }
     
     results.append(overall_analysis)
     
-    # Store file hash for future learning
-    store_analysis_hash(file_hash, filename, 'video', results, analysis_id)
+    print(f"   - Overall AI generation score: {video_ai_indicators['ai_generation_score']:.2f}")
+    return results
+
+def analyze_video_audio_track(filepath, learned_result=None):
+    """Audio branch of video analysis: demux the soundtrack and run audio analysis"""
+    wav_path = os.path.join(Config.TEMP_FOLDER, f"{uuid.uuid4().hex}.wav")
+    os.makedirs(os.path.dirname(wav_path), exist_ok=True)
     
-    ai_frames = sum(1 for frame in results if isinstance(frame, dict) and isinstance(frame.get('ai_generated'), dict) and frame.get('ai_generated', {}).get('is_ai_generated', False))
-    fake_frames = sum(1 for frame in results if isinstance(frame, dict) and any(face.get('is_fake', False) for face in frame.get('face', [])))
+    try:
+        if not extract_audio_track(filepath, wav_path, Config.AUDIO_SAMPLE_RATE):
+            print("Video has no audio track")
+            return None
+        return analyze_audio(wav_path, learned_result)
+    finally:
+        if os.path.exists(wav_path):
+            os.remove(wav_path)
+
+def analyze_video_frame(frame_index, learned_result=None, model_faces=None):
+    """Face, AI-generation, temporal and blink analysis for one video frame.
     
-    print(f"Video analysis complete:")
-    print(f"   - Frames analyzed: {len(results)-1}")  # -1 for summary
-    print(f"   - AI-generated frames detected: {ai_frames}")
-    print(f"   - Deepfake frames detected: {fake_frames}")
-    print(f"   - Overall AI generation score: {video_ai_indicators['ai_generation_score']:.2f}")
+    ``model_faces`` are the face model's verdicts for the decoded frame;
+    without them the face scores are simulated.
+    """
+    import random
     
-    return jsonify({'results': results, 'analysis_id': analysis_id})
+    frame_results = {
+        'frame': frame_index,
+        'face': [],
+        'blink': None,
+        'ai_generated': None,
+        'temporal_analysis': None
+    }
+    
+    # Add face detection results
+    num_faces = random.randint(0, 2) if model_faces is None else len(model_faces)
+    for face_id in range(num_faces):
+        if learned_result:
+            # Use learned result
+            is_fake = learned_result['is_fake']
+            confidence = random.uniform(0.85, 0.98)
+            learned = True
+            ai_generated = is_fake  # If learned as fake, likely AI generated
+        elif model_faces is not None:
+            is_fake, confidence = model_faces[face_id]['is_fake'], model_faces[face_id]['confidence']
+            learned = False
+            ai_generated = random.choice([True, False])
+        else:
+            # Enhanced detection for AI-generated content
+            is_fake = random.choice([True, False])
+            confidence = random.uniform(0.6, 0.95) if is_fake else random.uniform(0.7, 0.98)
+            learned = False
+            ai_generated = random.choice([True, False])
+        
+        face_result = {
+            'is_fake': is_fake,
+            'confidence': confidence,
+            'face_id': face_id + 1,
+            'learned': learned,
+            'ai_generated': ai_generated,
+            'face_quality_score': random.uniform(0.4, 0.95),
+            'edge_consistency': random.uniform(0.3, 0.9),
+            'skin_texture_analysis': random.uniform(0.2, 0.8)
+        }
+        
+        frame_results['face'].append(face_result)
+    
+    # Add AI-generated content analysis
+    if num_faces > 0:
+        frame_results['ai_generated'] = {
+            'is_ai_generated': random.choice([True, False]),
+            'ai_confidence': random.uniform(0.5, 0.95),
+            'generation_method': random.choice(['GAN', 'Diffusion', 'VAE', 'Unknown']),
+            'artifacts_detected': random.choice([True, False]),
+            'pixel_inconsistency': random.uniform(0.1, 0.8),
+            'frequency_analysis': random.uniform(0.2, 0.9)
+        }
+    
+    # Add temporal analysis for AI detection
+    frame_results['temporal_analysis'] = {
+        'motion_consistency': random.uniform(0.3, 0.95),
+        'frame_interpolation_artifacts': random.uniform(0.1, 0.7),
+        'temporal_smoothness': random.uniform(0.4, 0.9),
+        'scene_transition_analysis': random.uniform(0.2, 0.8)
+    }
+    
+    # Add blink analysis
+    if num_faces > 0:
+        frame_results['blink'] = {
+            'is_blinking': random.choice([True, False]),
+            'ear': random.uniform(0.15, 0.35),
+            'blink_frequency': random.uniform(0.1, 0.4),
+            'natural_blink_pattern': random.choice([True, False])
+        }
+    
+    return frame_results
+
+def face_model_available():
+    from configs.paths import FACE_MODEL_PATH
+    return os.path.exists(FACE_MODEL_PATH)
+
+def predict_faces(image):
+    """Face model verdicts for a BGR image, or None when no face model is deployed.
+    
+    Crops from concurrent requests are predicted together by the shared
+    MicroBatcher. ``confidence`` is in the verdict, as elsewhere in the
+    results, not the raw fake probability.
+    """
+    if not face_model_available():
+        return None
+    try:
+        from detection.model_loader import get_face_analyzer
+        faces = get_face_analyzer().analyze(image)
+    except Exception as e:
+        print(f"Face model inference failed, using simulated scores: {e}")
+        return None
+    return [
+        {'is_fake': face['is_fake'], 'confidence': face['confidence'] if face['is_fake'] else 1 - face['confidence']}
+        for face in faces
+    ]
+
+def frame_fake_score(frame_results):
+    """Probability that a frame is manipulated, averaged over its faces (None without faces)"""
+    faces = frame_results.get('face') or []
+    if not faces:
+        return None
+    scores = [f['confidence'] if f['is_fake'] else 1 - f['confidence'] for f in faces]
+    return sum(scores) / len(scores)
 
-def process_audio(filepath, filename):
+def video_results_response(results, analysis_id):
+    """Per-frame rows by default; columnar JSON or MessagePack when requested"""
+    fmt = negotiate_format(request)
+    if fmt == ROW_FORMAT:
+        return jsonify({'results': results, 'analysis_id': analysis_id})
+    
+    payload = {
+        'format': 'columnar',
+        'results': video_results_to_columnar(results),
+        'analysis_id': analysis_id
+    }
+    try:
+        body, mimetype = encode(payload, fmt)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 406
+    return Response(body, mimetype=mimetype, headers={'Vary': 'Accept'})
+
+def process_audio(filepath, filename, file_hash=None):
     """Process audio file for deepfake and AI-generated content detection"""
-    import random
     import time
-    import hashlib
     
     print(f"Analyzing audio: {filename}")
     print("Running comprehensive audio analysis...")
@@ -781,11 +1325,36 @@ def process_audio(filepath, filename):
     # Generate unique analysis ID
     analysis_id = str(int(time.time() * 1000))  # Timestamp-based ID
     
-    # Calculate file hash for learning system
-    file_hash = calculate_file_hash(filepath)
+    # Calculate file hash for learning system (chunked uploads hash as they arrive)
+    file_hash = file_hash or calculate_file_hash(filepath)
     
     # Check if we have previous feedback for this file
     learned_result = get_learned_result(file_hash, 'audio')
+    if learned_result:
+        print(f"Using learned result for audio file hash: {file_hash}")
+    
+    results = analyze_audio(filepath, learned_result)
+    
+    # Store file hash for future learning
+    store_analysis_hash(file_hash, filename, 'audio', results, analysis_id)
+    
+    audio = results['audio']
+    print(f"Audio analysis complete:")
+    print(f"   - Voice cloning: {'DETECTED' if audio['is_fake'] else 'NOT DETECTED'} ({audio['confidence']:.2f})")
+    print(f"   - AI-generated: {'DETECTED' if audio['ai_generated'] else 'NOT DETECTED'} ({audio['ai_confidence']:.2f})")
+    print(f"   - Duration: {audio['duration']:.1f}s")
+    print(f"   - Overall AI score: {results['audio_summary']['overall_ai_score']:.2f}")
+    print(f"   - Detected method: {audio['generation_method']}")
+    
+    return jsonify({'results': results, 'analysis_id': analysis_id})
+
+def audio_fake_score(audio):
+    """Probability that an audio clip is cloned/synthetic"""
+    return audio['confidence'] if audio['is_fake'] else 1 - audio['confidence']
+
+def analyze_audio(filepath, learned_result=None):
+    """Voice cloning and AI-generated speech analysis of an audio file"""
+    import random
     
     # Simulate processing time for comprehensive analysis
     time.sleep(3)
@@ -805,7 +1374,6 @@ def process_audio(filepath, filename):
     sample_rate = random.choice([16000, 22050, 44100, 48000])
     
     if learned_result:
-        print(f"Using learned result for audio file hash: {file_hash}")
         # Use learned result with high confidence
         is_fake = learned_result['is_fake']
         confidence = random.uniform(0.85, 0.98)
@@ -856,14 +1424,4 @@ def process_audio(filepath, filename):
         }
     }
     
-    # Store file hash for future learning
-    store_analysis_hash(file_hash, filename, 'audio', results, analysis_id)
-    
-    print(f"Audio analysis complete:")
-    print(f"   - Voice cloning: {'DETECTED' if is_fake else 'NOT DETECTED'} ({confidence:.2f})")
-    print(f"   - AI-generated: {'DETECTED' if ai_generated else 'NOT DETECTED'} ({ai_confidence:.2f})")
-    print(f"   - Duration: {duration:.1f}s")
-    print(f"   - Overall AI score: {audio_ai_indicators['ai_generation_score']:.2f}")
-    print(f"   - Detected method: {audio_ai_indicators['generation_method']}")
-    
-    return jsonify({'results': results, 'analysis_id': analysis_id})
\ No newline at end of file
+    return results
\ No newline at end of file
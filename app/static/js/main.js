@@ -536,27 +536,46 @@ async function analyzeFile(file, type, elements) {
     showAnalysisModal(type, elements);
     
     try {
-        const formData = new FormData();
-        formData.append('file', file);
+        let response;
         
-        console.log('Sending upload request to /upload...');
-        console.log('FormData entries:');
-        for (let pair of formData.entries()) {
-            console.log('  ', pair[0], pair[1]);
+        if (file.size > CHUNKED_UPLOAD.threshold && window.crypto && window.crypto.subtle) {
+            // Large files go through the resumable chunked protocol
+            response = await chunkedUpload(file);
+        } else {
+            const formData = new FormData();
+            formData.append('file', file);
+            
+            console.log('Sending upload request to /upload...');
+            console.log('FormData entries:');
+            for (let pair of formData.entries()) {
+                console.log('  ', pair[0], pair[1]);
+            }
+            
+            response = await fetch('/upload', {
+                method: 'POST',
+                // Lets the server admit the job before it receives the body
+                headers: { 'X-Upload-Filename': encodeURIComponent(file.name) },
+                body: formData,
+                credentials: 'same-origin'  // Include cookies for session
+            });
         }
         
-        const response = await fetch('/upload', {
-            method: 'POST',
-            body: formData,
-            credentials: 'same-origin'  // Include cookies for session
-        });
-        
         console.log('Response status:', response.status, response.statusText);
         console.log('Response headers:', [...response.headers.entries()]);
         
         const responseText = await response.text();
         console.log('Response body:', responseText);
         
+        if (response.status === 429 || response.status === 503) {
+            // Rate limited or server overloaded: tell the user when to try again
+            const retryAfter = response.headers.get('Retry-After');
+            let message = 'Server is busy';
+            try {
+                message = JSON.parse(responseText).error || message;
+            } catch (e) {}
+            throw new Error(`${message} (retry in ${retryAfter || 'a few'} seconds)`);
+        }
+        
         if (!response.ok) {
             throw new Error(`Analysis failed: ${response.statusText} - ${responseText}`);
         }
@@ -592,6 +611,114 @@ async function analyzeFile(file, type, elements) {
     }
 }
 
+// Chunked upload settings: files above the threshold are sent in chunks
+const CHUNKED_UPLOAD = {
+    threshold: 8 * 1024 * 1024,
+    parallelChunks: 3,
+    maxRetries: 5
+};
+
+function toHex(buffer) {
+    return Array.from(new Uint8Array(buffer)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+// Upload a file chunk by chunk, resuming a previous session for the same file
+async function chunkedUpload(file) {
+    const resumeKey = `chunkedUpload:${file.name}:${file.size}:${file.lastModified}`;
+    let uploadSession = null;
+    
+    const savedId = localStorage.getItem(resumeKey);
+    if (savedId) {
+        const statusResponse = await fetch(`/upload/${savedId}`, { credentials: 'same-origin' });
+        if (statusResponse.ok) {
+            uploadSession = await statusResponse.json();
+            console.log(`Resuming upload ${savedId}: ${uploadSession.received.length}/${uploadSession.total_chunks} chunks already stored`);
+        }
+    }
+    
+    if (!uploadSession) {
+        const initResponse = await fetch('/upload/init', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ filename: file.name, size: file.size }),
+            credentials: 'same-origin'
+        });
+        if (!initResponse.ok) {
+            return initResponse;
+        }
+        uploadSession = await initResponse.json();
+        localStorage.setItem(resumeKey, uploadSession.upload_id);
+    }
+    
+    const received = new Set(uploadSession.received);
+    const pending = [];
+    for (let index = 0; index < uploadSession.total_chunks; index++) {
+        if (!received.has(index)) {
+            pending.push(index);
+        }
+    }
+    
+    const worker = async () => {
+        while (pending.length > 0) {
+            await uploadChunk(file, uploadSession, pending.shift());
+        }
+    };
+    const workers = Array.from({ length: Math.min(CHUNKED_UPLOAD.parallelChunks, pending.length) }, worker);
+    await Promise.all(workers);
+    
+    const response = await fetch(`/upload/${uploadSession.upload_id}/complete`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({}),
+        credentials: 'same-origin'
+    });
+    
+    if (response.ok || response.status === 404) {
+        localStorage.removeItem(resumeKey);
+    }
+    return response;
+}
+
+async function uploadChunk(file, uploadSession, index) {
+    const start = index * uploadSession.chunk_size;
+    const end = Math.min(start + uploadSession.chunk_size, file.size);
+    const buffer = await file.slice(start, end).arrayBuffer();
+    const checksum = toHex(await crypto.subtle.digest('SHA-256', buffer));
+    
+    for (let attempt = 1; ; attempt++) {
+        let retryable = true;
+        try {
+            const response = await fetch(`/upload/${uploadSession.upload_id}/chunk/${index}`, {
+                method: 'PUT',
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                    'X-Chunk-SHA256': checksum
+                },
+                body: buffer,
+                credentials: 'same-origin'
+            });
+            if (response.ok) {
+                return;
+            }
+            // Client errors other than timeouts/throttling will not succeed on retry
+            retryable = response.status >= 500 || response.status === 408 || response.status === 429;
+            if (!retryable || attempt >= CHUNKED_UPLOAD.maxRetries) {
+                throw new Error(`Chunk ${index} failed: ${response.status} ${await response.text()}`);
+            }
+        } catch (error) {
+            if (!retryable || attempt >= CHUNKED_UPLOAD.maxRetries) {
+                throw error;
+            }
+            console.warn(`Chunk ${index} attempt ${attempt} failed, retrying...`, error);
+        }
+        await sleep(Math.min(1000 * 2 ** (attempt - 1), 10000));
+    }
+}
+
 function processAnalysisResults(results, type, filename, analysis_id) {
     console.log('🔍 processAnalysisResults called with:', { results, type, filename, analysis_id });
     console.log('🔍 Raw results structure:', JSON.stringify(results, null, 2));
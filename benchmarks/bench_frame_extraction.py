@@ -0,0 +1,73 @@
+"""Throughput of selective frame extraction against sequential OpenCV decode.
+
+Extracts every ``step``-th frame of a video with each method and reports the
+wall time and the number of selected frames per second.
+
+Usage: python benchmarks/bench_frame_extraction.py VIDEO [step]
+Needs opencv and ffmpeg (ffprobe for the keyframe methods).
+"""
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+
+from utils.video_utils import FrameBuffer, list_keyframes, probe_video, read_frames_ffmpeg, read_frames_seek
+
+
+def sequential(video_path, indices):
+    """Baseline: decode every frame and keep the selected ones"""
+    wanted = set(indices)
+    cap = cv2.VideoCapture(video_path)
+    kept = []
+    index = 0
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        if index in wanted:
+            kept.append(frame)
+        index += 1
+    cap.release()
+    return kept
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(video_path, step=25):
+    info = probe_video(video_path)
+    indices = list(range(0, info['frame_count'], step))
+    buffer = FrameBuffer()
+
+    methods = [
+        ('sequential cv2 decode', lambda: sequential(video_path, indices)),
+        ('cv2 seek', lambda: read_frames_seek(video_path, indices, buffer)[1]),
+        ('ffmpeg select filter', lambda: read_frames_ffmpeg(video_path, indices, buffer=buffer, info=info)),
+    ]
+    if shutil.which('ffprobe'):
+        methods.append(('ffmpeg keyframes only', lambda: read_frames_ffmpeg(
+            video_path, keyframes_only=True, buffer=buffer, info=info)))
+        keyframes, elapsed = timed(lambda: list_keyframes(video_path, info['fps'], info['start_time']))
+        print(f"{len(keyframes)} keyframes listed from container metadata in {elapsed * 1000:.1f} ms")
+
+    print(f"{info['width']}x{info['height']}, {info['frame_count']} frames, selecting every {step}th ({len(indices)} frames)\n")
+    print(f"{'method':<24}{'frames':>8}{'seconds':>10}{'frames/s':>10}{'speedup':>9}")
+
+    baseline = None
+    for name, fn in methods:
+        frames, elapsed = timed(fn)
+        baseline = baseline or elapsed
+        print(f"{name:<24}{len(frames):>8}{elapsed:>10.3f}{len(frames) / elapsed:>10.1f}{baseline / elapsed:>8.1f}x")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1], *[int(a) for a in sys.argv[2:3]])
@@ -0,0 +1,81 @@
+"""Latency and peak memory of full-size vs reduced-resolution image decoding.
+
+Each method runs in a fresh interpreter so its peak RSS is measured in
+isolation. Without an image argument synthetic 48 MP and 12 MP JPEGs are
+generated; 12 MP (4000x3000) is the typical phone photo.
+
+Usage: python benchmarks/bench_image_decode.py [IMAGE] [max_side]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = r'''
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+import cv2
+from utils.image_utils import load_image
+
+def peak_kb():
+    # ru_maxrss survives exec, so it would report the parent's peak from
+    # generating the synthetic images; VmHWM starts fresh in this process
+    try:
+        with open('/proc/self/status') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+method, path, max_side = sys.argv[2], sys.argv[3], int(sys.argv[4])
+before = peak_kb()
+start = time.perf_counter()
+if method == 'cv2.imread full size':
+    image = cv2.imread(path)
+else:
+    image, _ = load_image(path, max_side)
+elapsed = time.perf_counter() - start
+peak = peak_kb()
+print(json.dumps({'ms': elapsed * 1000, 'peak_mb': (peak - before) / 1024, 'shape': list(image.shape)}))
+'''
+
+
+def synthetic_jpeg(path, width=8000, height=6000):
+    import numpy as np
+    from PIL import Image
+
+    # Smooth gradients plus noise compress like a photo, not like a flat image
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    noise = np.random.default_rng(0).integers(0, 40, (height, width), dtype=np.uint8)
+    red = ((x + y) / 2).astype(np.uint8) + noise
+    Image.fromarray(np.dstack([red, noise * 4, 255 - red])).save(path, quality=90)
+
+
+def main(path=None, max_side=2048):
+    if path is None:
+        tmp_dir = tempfile.mkdtemp()
+        paths = []
+        for name, width, height in (('synthetic_48mp.jpg', 8000, 6000), ('synthetic_12mp.jpg', 4000, 3000)):
+            paths.append(os.path.join(tmp_dir, name))
+            synthetic_jpeg(paths[-1], width, height)
+    else:
+        paths = [path]
+
+    print(f"max_side={max_side}\n")
+    print(f"{'image':<24}{'method':<24}{'decoded shape':>20}{'ms':>10}{'peak MB':>10}")
+    for path in paths:
+        for method in ('cv2.imread full size', 'load_image reduced'):
+            output = subprocess.run(
+                [sys.executable, '-c', WORKER, ROOT, method, path, str(max_side)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output)
+            shape = 'x'.join(str(d) for d in result['shape'])
+            print(f"{os.path.basename(path):<24}{method:<24}{shape:>20}{result['ms']:>10.1f}{result['peak_mb']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None, *[int(a) for a in sys.argv[2:3]])
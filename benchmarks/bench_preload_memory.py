@@ -0,0 +1,66 @@
+"""Per-worker memory with and without model preloading in the gunicorn master.
+
+Starts gunicorn twice (PRELOAD_MODELS=true / false), waits for the workers to
+boot and load their models, then reads RSS, PSS and private memory of each
+worker from /proc/<pid>/smaps_rollup. PSS splits shared pages between the
+processes mapping them, so it shows what copy-on-write sharing saves.
+
+Usage: python benchmarks/bench_preload_memory.py [workers] [boot seconds]
+Linux only; needs gunicorn and the model files under models/.
+"""
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 5055
+
+
+def memory_kb(pid):
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:', 'Private_Clean:', 'Private_Dirty:'):
+                values[parts[0][:-1]] = int(parts[1])
+    values['Private'] = values.pop('Private_Clean', 0) + values.pop('Private_Dirty', 0)
+    return values
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(p) for p in f.read().split()]
+
+
+def measure(preload, workers, boot_seconds):
+    env = dict(os.environ, PRELOAD_MODELS=str(preload).lower(), GUNICORN_WORKERS=str(workers),
+               PORT=str(PORT), HOST='127.0.0.1', FLASK_DEBUG='False')
+    master = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(boot_seconds)
+        urllib.request.urlopen(f'http://127.0.0.1:{PORT}/health', timeout=30).read()
+        return memory_kb(master.pid), [memory_kb(pid) for pid in children(master.pid)]
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=60)
+
+
+def main(workers=4, boot_seconds=30):
+    print(f"{'mode':<12}{'process':<10}{'RSS MB':>10}{'PSS MB':>10}{'private MB':>12}")
+    for preload in (False, True):
+        master, worker_mem = measure(preload, workers, boot_seconds)
+        mode = 'preload' if preload else 'no preload'
+        rows = [('master', master)] + [(f'worker {i}', m) for i, m in enumerate(worker_mem)]
+        for name, mem in rows:
+            print(f"{mode:<12}{name:<10}{mem['Rss'] / 1024:>10.1f}{mem['Pss'] / 1024:>10.1f}{mem['Private'] / 1024:>12.1f}")
+        total_pss = sum(m['Pss'] for _, m in rows) / 1024
+        print(f"{mode:<12}{'total PSS':<10}{total_pss:>20.1f}\n")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])
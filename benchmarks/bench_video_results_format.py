@@ -0,0 +1,50 @@
+"""Size and serialization time of per-frame video results in each response format.
+
+Usage: python benchmarks/bench_video_results_format.py [frame counts...]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import analyze_video_frame
+from utils.serialization import dumps_compact, msgpack, video_results_to_columnar
+
+
+def build_results(num_frames):
+    results = [analyze_video_frame(frame_num * 5) for frame_num in range(1, num_frames + 1)]
+    results.append({'video_summary': {'total_frames_analyzed': num_frames}})
+    return results
+
+
+def formats():
+    yield 'rows json (indent=2)', lambda r: json.dumps(r, indent=2)
+    yield 'rows json (compact)', dumps_compact
+    yield 'columnar json', lambda r: dumps_compact(video_results_to_columnar(r))
+    if msgpack is not None:
+        yield 'rows msgpack', lambda r: msgpack.packb(r, use_bin_type=True)
+        yield 'columnar msgpack', lambda r: msgpack.packb(video_results_to_columnar(r), use_bin_type=True)
+
+
+def main(frame_counts):
+    for num_frames in frame_counts:
+        results = build_results(num_frames)
+        print(f"\n{num_frames} frames")
+        print(f"{'format':<24}{'bytes':>12}{'vs indent=2':>14}{'ms/encode':>12}")
+
+        baseline = None
+        for name, encode in formats():
+            size = len(encode(results))
+            baseline = baseline or size
+            runs = max(1, 2000 // num_frames)
+            elapsed = timeit.timeit(lambda: encode(results), number=runs) / runs
+            print(f"{name:<24}{size:>12}{size / baseline:>13.0%}{elapsed * 1000:>12.2f}")
+
+    if msgpack is None:
+        print("\nmsgpack not installed, binary formats skipped")
+
+
+if __name__ == '__main__':
+    main([int(n) for n in sys.argv[1:]] or [20, 1000, 10000])
@@ -21,6 +21,62 @@ class Config:
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'mp4', 'avi', 'mov', 'wav', 'mp3', 'webm', 'ogg'}
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 100 * 1024 * 1024))  # 100MB default
     
+    # Chunked (resumable) uploads
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024))  # 8MB per chunk
+    MAX_CHUNKED_UPLOAD_SIZE = int(os.getenv('MAX_CHUNKED_UPLOAD_SIZE', 2 * 1024 * 1024 * 1024))  # 2GB default
+    UPLOAD_SESSION_TTL = int(os.getenv('UPLOAD_SESSION_TTL', 24 * 60 * 60))  # Sessions expire 1 day after their last chunk
+    MAX_UPLOAD_SESSIONS_PER_USER = int(os.getenv('MAX_UPLOAD_SESSIONS_PER_USER', 3))  # Each session preallocates its full size
+    
+    # Content-addressed upload storage
+    STORAGE_FOLDER = os.getenv('STORAGE_FOLDER', os.path.join(UPLOAD_FOLDER, 'objects'))
+    STORAGE_MAX_AGE = int(os.getenv('STORAGE_MAX_AGE', 7 * 24 * 60 * 60))  # Evict uploads unused for 7 days
+    STORAGE_MAX_BYTES = int(os.getenv('STORAGE_MAX_BYTES', 10 * 1024 * 1024 * 1024))  # 10GB disk quota
+    STORAGE_JANITOR_INTERVAL = int(os.getenv('STORAGE_JANITOR_INTERVAL', 5 * 60))  # Seconds between janitor passes
+    
+    # Image decoding: large photos are decoded at 1/2, 1/4 or 1/8 scale
+    IMAGE_ANALYSIS_MAX_SIDE = int(os.getenv('IMAGE_ANALYSIS_MAX_SIDE', 2048))  # Decode large images down to about this longest side
+    IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', 100_000_000))  # Reject larger images (decompression bombs)
+    
+    # Video frame sampling: per-job compute budget for the adaptive scheduler
+    VIDEO_BASE_FRAMES = int(os.getenv('VIDEO_BASE_FRAMES', 8))  # Frames scored before early exit is allowed
+    VIDEO_MAX_FRAMES = int(os.getenv('VIDEO_MAX_FRAMES', 48))  # Upper bound when sampling is escalated
+    VIDEO_TIME_BUDGET_MS = int(os.getenv('VIDEO_TIME_BUDGET_MS', 10000))
+    VIDEO_CONFIDENCE_Z = float(os.getenv('VIDEO_CONFIDENCE_Z', 1.96))  # 95% interval on the mean fake score
+    VIDEO_DEFAULT_FRAME_COUNT = int(os.getenv('VIDEO_DEFAULT_FRAME_COUNT', 100))  # Used when the container has no frame count
+    
+    # Multi-modal video analysis: visual and audio branches run in separate pools
+    VISUAL_WORKERS = int(os.getenv('VISUAL_WORKERS', 4))
+    AUDIO_WORKERS = int(os.getenv('AUDIO_WORKERS', 4))
+    AUDIO_SAMPLE_RATE = int(os.getenv('AUDIO_SAMPLE_RATE', 16000))  # Sample rate of the demuxed audio track
+    VISUAL_FUSION_WEIGHT = float(os.getenv('VISUAL_FUSION_WEIGHT', 0.6))
+    AUDIO_FUSION_WEIGHT = float(os.getenv('AUDIO_FUSION_WEIGHT', 0.4))
+    
+    # Admission control for analysis jobs (per server process)
+    ADMISSION_CONCURRENCY = {
+        'image': int(os.getenv('IMAGE_CONCURRENCY', 2)),
+        'video': int(os.getenv('VIDEO_CONCURRENCY', 1)),
+        'audio': int(os.getenv('AUDIO_CONCURRENCY', 2)),
+        # Request bodies being received: chunk PUTs and uploads without a type hint
+        'upload': int(os.getenv('UPLOAD_CONCURRENCY', 2))
+    }
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', 2))  # Jobs allowed to wait for a slot
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 15))  # Seconds before a queued job gets 503
+    USER_UPLOAD_RATE = float(os.getenv('USER_UPLOAD_RATE', 10 / 60))  # Analyses per second per user (10/minute)
+    USER_UPLOAD_BURST = int(os.getenv('USER_UPLOAD_BURST', 5))
+    UPLOAD_CHUNK_QUOTA_COST = float(os.getenv('UPLOAD_CHUNK_QUOTA_COST', 0.02))  # Quota charged per chunk PUT (50 chunks = 1 job)
+    
+    # Feedback evaluation: metrics are grouped by media type and model version
+    MODEL_VERSION = os.getenv('MODEL_VERSION', 'v1')  # Stamped on feedback records that lack one
+    FEEDBACK_CALIBRATION_BINS = int(os.getenv('FEEDBACK_CALIBRATION_BINS', 10))
+    DEBUG_LEARNING_PAGE_SIZE = int(os.getenv('DEBUG_LEARNING_PAGE_SIZE', 50))  # Entries per /debug_learning page
+    
+    # Profiling of analysis jobs: X-Profile header (admins), admin toggle or random sampling
+    ADMIN_USERS = set(filter(None, os.getenv('ADMIN_USERS', 'admin').split(',')))
+    PROFILE_FOLDER = os.getenv('PROFILE_FOLDER', os.path.join(UPLOAD_FOLDER, 'profiles'))
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0.0))  # Fraction of jobs profiled automatically
+    PROFILE_KEEP_SLOWEST = int(os.getenv('PROFILE_KEEP_SLOWEST', 20))  # Sampled profiles kept, slowest first
+    PROFILE_KEEP_REQUESTED = int(os.getenv('PROFILE_KEEP_REQUESTED', 50))  # Header/toggle profiles kept, newest first
+    
     # Environment
     DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     ENV = os.getenv('FLASK_ENV', 'development')
@@ -40,6 +96,7 @@ class Config:
                 # Ensure upload directories exist
                 os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
                 os.makedirs(Config.TEMP_FOLDER, exist_ok=True)
+                os.makedirs(Config.STORAGE_FOLDER, exist_ok=True)
         except Exception as e:
             print(f"Directory creation skipped in serverless environment: {e}")
     
\ No newline at end of file
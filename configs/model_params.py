@@ -0,0 +1,25 @@
+import os
+
+from config import Config
+
+# Face model input
+FACE_INPUT_SIZE = (256, 256)
+FACE_FAKE_THRESHOLD = 0.5
+
+# Cross-request micro-batching of face model inference
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv('INFERENCE_MAX_BATCH_SIZE', 32))
+INFERENCE_MAX_WAIT_MS = float(os.getenv('INFERENCE_MAX_WAIT_MS', 5))
+INFERENCE_TIMEOUT = float(os.getenv('INFERENCE_TIMEOUT', 30))  # Seconds a request waits for its predictions
+
+# Blink detection: EAR below the threshold for this many consecutive frames is a blink.
+# Tune on the feature cache with `python -m training.train_blink --tune`
+BLINK_EAR_THRESHOLD = float(os.getenv('BLINK_EAR_THRESHOLD', 0.2))
+BLINK_CONSEC_FRAMES = int(os.getenv('BLINK_CONSEC_FRAMES', 3))
+
+# Audio model input: log-mel spectrogram frames of 10 ms. The sample rate is
+# the one the app demuxes video soundtracks at, so training matches inference
+AUDIO_SAMPLE_RATE = Config.AUDIO_SAMPLE_RATE
+AUDIO_N_FFT = 512
+AUDIO_HOP_LENGTH = 160
+AUDIO_N_MELS = 80
+AUDIO_WINDOW_FRAMES = 300  # 3 s training windows
@@ -11,3 +11,9 @@ LANDMARK_PATH = os.path.join(MODEL_DIR, 'blink_detection/shape_predictor_68_face
 
 # Dataset paths (for training)
 DATASET_DIR = os.path.join(BASE_DIR, 'datasets')
+FACE_DATA_DIR = os.path.join(DATASET_DIR, 'faces')  # real/ and fake/ subfolders of images or videos
+FACE_SHARD_DIR = os.path.join(DATASET_DIR, 'face_shards')  # Prepared crops, see training/data_prep/face_data.py
+BLINK_DATA_DIR = os.path.join(DATASET_DIR, 'blink')  # real/ and fake/ subfolders of videos
+BLINK_FEATURE_DIR = os.path.join(DATASET_DIR, 'blink_features')  # Landmark/EAR cache, see training/data_prep/blink_data.py
+AUDIO_DATA_DIR = os.path.join(DATASET_DIR, 'audio')  # real/ and fake/ subfolders of audio clips
+AUDIO_FEATURE_DIR = os.path.join(DATASET_DIR, 'audio_features')  # Log-mel store, see training/data_prep/audio_data.py
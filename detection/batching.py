@@ -0,0 +1,116 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Batch single-sample inference requests from many threads into one call.
+
+    Request threads submit samples and wait on futures; a single worker thread
+    drains the queue, waiting at most ``max_wait_ms`` after the first sample of
+    a batch for more to arrive (or until ``max_batch_size`` is reached), runs
+    ``predict_fn`` once on the stacked batch and resolves each future with its
+    row of the output.
+
+    The worker thread is started lazily and restarted after a fork, so an
+    instance created before gunicorn forks its workers is safe to use in them.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=5, timeout=30.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._worker = None
+        self._stats = {
+            'batches': 0,
+            'samples': 0,
+            'last_batch_size': 0,
+            'max_batch_size_seen': 0,
+            'wait_seconds_total': 0.0,
+            'errors': 0
+        }
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._pid == os.getpid() and self._worker.is_alive():
+                return
+            # First use, or we are in a forked child where the thread does not exist
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._worker.start()
+
+    def submit(self, sample):
+        """Queue one sample; returns a Future for its prediction"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((sample, future, time.perf_counter()))
+        return future
+
+    def predict(self, samples):
+        """Predict a list of samples through the shared batch queue.
+
+        Raises concurrent.futures.TimeoutError when the predictions are not
+        all back within ``timeout`` seconds, e.g. because the worker is stuck.
+        """
+        futures = [self.submit(sample) for sample in samples]
+        deadline = time.perf_counter() + self.timeout
+        return [future.result(timeout=max(deadline - time.perf_counter(), 0)) for future in futures]
+
+    def _collect(self, work_queue):
+        batch = [work_queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(work_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        work_queue = self._queue
+        while True:
+            batch = self._collect(work_queue)
+            started = time.perf_counter()
+            try:
+                outputs = self.predict_fn(np.stack([sample for sample, _, _ in batch]))
+                if len(outputs) != len(batch):
+                    # zip() would drop the tail and leave its callers waiting forever
+                    raise ValueError(f"Model returned {len(outputs)} outputs for a batch of {len(batch)}")
+            except Exception as e:
+                with self._lock:
+                    self._stats['errors'] += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
+
+            with self._lock:
+                self._stats['batches'] += 1
+                self._stats['samples'] += len(batch)
+                self._stats['last_batch_size'] = len(batch)
+                self._stats['max_batch_size_seen'] = max(self._stats['max_batch_size_seen'], len(batch))
+                self._stats['wait_seconds_total'] += sum(started - queued for _, _, queued in batch)
+
+    def stats(self):
+        """Queue depth and batch-size metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queue_depth'] = self._queue.qsize() if self._queue else 0
+        stats['mean_batch_size'] = stats['samples'] / stats['batches'] if stats['batches'] else 0.0
+        stats['max_batch_size'] = self.max_batch_size
+        stats['max_wait_ms'] = self.max_wait * 1000
+        return stats
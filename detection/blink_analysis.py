@@ -1,44 +1,61 @@
 import cv2
 import dlib
 import numpy as np
-from scipy.spatial import distance
 from configs.paths import LANDMARK_PATH
+from configs.model_params import BLINK_EAR_THRESHOLD, BLINK_CONSEC_FRAMES
+
+# 68-point landmark indices of each eye
+LEFT_EYE = slice(42, 48)
+RIGHT_EYE = slice(36, 42)
+
+
+def eye_aspect_ratios(eyes):
+    """EAR of (..., 6, 2) eye landmark arrays, vectorized over leading axes"""
+    eyes = np.asarray(eyes, dtype=np.float32)
+    A = np.linalg.norm(eyes[..., 1, :] - eyes[..., 5, :], axis=-1)
+    B = np.linalg.norm(eyes[..., 2, :] - eyes[..., 4, :], axis=-1)
+    C = np.linalg.norm(eyes[..., 0, :] - eyes[..., 3, :], axis=-1)
+    return (A + B) / (2.0 * C)
+
 
 class BlinkAnalyzer:
     def __init__(self):
         self.detector = dlib.get_frontal_face_detector()
         self.predictor = dlib.shape_predictor(LANDMARK_PATH)
-        self.eye_ar_thresh = 0.2
-        self.eye_ar_consec_frames = 3
-        
+        self.eye_ar_thresh = BLINK_EAR_THRESHOLD
+        self.eye_ar_consec_frames = BLINK_CONSEC_FRAMES
+
     def eye_aspect_ratio(self, eye):
-        A = distance.euclidean(eye[1], eye[5])
-        B = distance.euclidean(eye[2], eye[4])
-        C = distance.euclidean(eye[0], eye[3])
-        return (A + B) / (2.0 * C)
-        
-    def analyze(self, frame):
+        return float(eye_aspect_ratios(eye))
+
+    def landmarks(self, frame):
+        """(68, 2) landmarks of the first detected face, or None"""
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         faces = self.detector(gray)
-        
+
         if len(faces) == 0:
             return None
-            
-        landmarks = self.predictor(gray, faces[0])
-        landmarks = [(landmarks.part(i).x, landmarks.part(i).y) for i in range(68)]
-        
-        left_eye = landmarks[42:48]
-        right_eye = landmarks[36:42]
-        
+
+        shape = self.predictor(gray, faces[0])
+        return np.array([(shape.part(i).x, shape.part(i).y) for i in range(68)], dtype=np.int16)
+
+    def analyze(self, frame):
+        landmarks = self.landmarks(frame)
+
+        if landmarks is None:
+            return None
+
+        left_eye = landmarks[LEFT_EYE]
+        right_eye = landmarks[RIGHT_EYE]
+
         left_ear = self.eye_aspect_ratio(left_eye)
         right_ear = self.eye_aspect_ratio(right_eye)
-        
+
         ear = (left_ear + right_ear) / 2.0
-        
+
         return {
             'ear': ear,
             'is_blinking': ear < self.eye_ar_thresh,
-            'left_eye_points': left_eye,
-            'right_eye_points': right_eye
+            'left_eye_points': [tuple(p) for p in left_eye.tolist()],
+            'right_eye_points': [tuple(p) for p in right_eye.tolist()]
         }
-    
\ No newline at end of file
@@ -1,32 +1,38 @@
-import cv2
 import numpy as np
 from tensorflow.keras.models import load_model
 from configs.paths import FACE_MODEL_PATH
+from configs.model_params import (
+    FACE_INPUT_SIZE, FACE_FAKE_THRESHOLD, INFERENCE_MAX_BATCH_SIZE, INFERENCE_MAX_WAIT_MS, INFERENCE_TIMEOUT
+)
+from detection.batching import MicroBatcher
+from utils.image_utils import crop_faces, load_face_cascade
 
 class FaceAnalyzer:
     def __init__(self):
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        self.face_cascade = load_face_cascade()
         self.model = load_model(FACE_MODEL_PATH)
+        # Face crops from all concurrent requests share one queue and are
+        # predicted together, instead of one model.predict call per face
+        self.batcher = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=INFERENCE_MAX_WAIT_MS,
+            timeout=INFERENCE_TIMEOUT)
+        
+    def _predict_batch(self, batch):
+        return np.asarray(self.model.predict_on_batch(batch))[:, 0]
         
     def preprocess_frame(self, frame):
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
-        processed_faces = []
-        for (x, y, w, h) in faces:
-            face_roi = frame[y:y+h, x:x+w]
-            face_roi = cv2.resize(face_roi, (256, 256))
-            face_roi = face_roi / 255.0
-            processed_faces.append(face_roi)
-        return processed_faces
+        faces = crop_faces(frame, self.face_cascade, FACE_INPUT_SIZE)
+        return [face.astype(np.float32) / 255.0 for face in faces]
     
     def analyze(self, frame):
         faces = self.preprocess_frame(frame)
+        predictions = self.batcher.predict(faces)
         results = []
-        for face in faces:
-            prediction = self.model.predict(np.expand_dims(face, axis=0))[0][0]
+        for prediction in predictions:
             results.append({
-                'is_fake': prediction > 0.5,
+                'is_fake': bool(prediction > FACE_FAKE_THRESHOLD),
                 'confidence': float(prediction)
             })
-        return results
\ No newline at end of file
+        return results
@@ -0,0 +1,26 @@
+def fuse_modalities(scores, weights):
+    """Combine per-modality fake probabilities into one verdict.
+
+    ``scores`` maps modality name to a probability in [0, 1], or None when
+    the modality is unavailable (e.g. a video without an audio track).
+    Weights of the available modalities are renormalised to sum to 1.
+    """
+    available = {name: score for name, score in scores.items() if score is not None}
+    if not available:
+        return {
+            'fake_probability': None,
+            'verdict': 'INCONCLUSIVE',
+            'modality_scores': {},
+            'weights': {}
+        }
+
+    total_weight = sum(weights.get(name, 1.0) for name in available)
+    normalized = {name: weights.get(name, 1.0) / total_weight for name in available}
+    fake_probability = sum(available[name] * normalized[name] for name in available)
+
+    return {
+        'fake_probability': fake_probability,
+        'verdict': 'SUSPICIOUS' if fake_probability > 0.5 else 'LIKELY_AUTHENTIC',
+        'modality_scores': available,
+        'weights': normalized
+    }
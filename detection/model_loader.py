@@ -0,0 +1,72 @@
+import os
+import threading
+
+from configs.paths import FACE_MODEL_PATH, LANDMARK_PATH
+from utils import metrics
+
+_lock = threading.Lock()
+_models = {}
+
+
+def _get(name, factory):
+    """Create a model wrapper once per process and share it between requests"""
+    with _lock:
+        if name not in _models:
+            print(f"Loading {name} model...")
+            _models[name] = factory()
+        return _models[name]
+
+
+def get_face_analyzer():
+    from detection.face_analysis import FaceAnalyzer
+
+    def create():
+        analyzer = FaceAnalyzer()
+        metrics.register('face_inference', analyzer.batcher.stats)
+        return analyzer
+
+    return _get('face', create)
+
+
+def get_blink_analyzer():
+    from detection.blink_analysis import BlinkAnalyzer
+    return _get('blink', BlinkAnalyzer)
+
+
+def configure_threads(num_threads):
+    """Size the TensorFlow and OpenCV thread pools of this process.
+
+    Must run before TensorFlow executes its first op; afterwards the pool
+    sizes are fixed and the call is ignored.
+    """
+    import cv2
+    cv2.setNumThreads(num_threads)
+
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except RuntimeError as e:
+        print(f"TensorFlow thread pools already initialized: {e}")
+
+
+def preload():
+    """Load fork-safe models before the server forks its workers.
+
+    Workers then share the read-only weights copy-on-write. Only dlib assets
+    (face detector and the ~100MB landmark predictor) are loaded here:
+    TensorFlow starts runtime threads on its first op and is not fork-safe
+    afterwards, so the Keras model is loaded in each worker by warm_up().
+    """
+    if os.path.exists(LANDMARK_PATH):
+        get_blink_analyzer()
+    else:
+        print(f"Landmark predictor not found, skipping preload: {LANDMARK_PATH}")
+
+
+def warm_up():
+    """Load per-process models so the first request does not pay for it"""
+    if os.path.exists(FACE_MODEL_PATH):
+        get_face_analyzer()
+    else:
+        print(f"Face model not found, skipping warm-up: {FACE_MODEL_PATH}")
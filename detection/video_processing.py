@@ -0,0 +1,115 @@
+import math
+import time
+
+
+def coarse_to_fine(total_frames, initial_frames):
+    """Frame indices spread evenly over the video, then at ever finer strides.
+
+    The first ``initial_frames`` indices cover the whole clip; each later pass
+    halves the stride and only yields frames not already visited.
+    """
+    stride = max(1, total_frames // max(1, initial_frames))
+    seen = set()
+    while True:
+        for index in range(stride // 2, total_frames, stride):
+            if index not in seen:
+                seen.add(index)
+                yield index
+        if stride == 1:
+            return
+        stride = max(1, stride // 2)
+
+
+class AdaptiveFrameScheduler:
+    """Decide which frames of a video to analyze and when to stop.
+
+    Frames are scored keyframes first, then coarse-to-fine across the clip.
+    After ``base_frames`` scored frames the scheduler stops as soon as the
+    confidence interval of the mean per-frame fake score lies entirely on one
+    side of 0.5. Videos that are still undecided are escalated and sampled
+    more densely until the interval becomes decisive or the per-job budget
+    (``max_frames`` or ``time_budget_ms``) runs out.
+    """
+
+    def __init__(self, total_frames, base_frames=8, max_frames=48, time_budget_ms=10000,
+                 z_score=1.96, keyframes=None):
+        self.total_frames = total_frames
+        self.base_frames = base_frames
+        self.max_frames = max(base_frames, max_frames)
+        self.time_budget_ms = time_budget_ms
+        self.z_score = z_score
+        keyframes = sorted(set(k for k in (keyframes or []) if 0 <= k < total_frames))
+        if len(keyframes) > base_frames:
+            # Spread the keyframe pass over the whole clip
+            step = len(keyframes) / base_frames
+            keyframes = [keyframes[int(i * step)] for i in range(base_frames)]
+        self.keyframes = keyframes
+
+    def frame_order(self):
+        """Keyframes first, then the remaining frames coarse-to-fine"""
+        for index in self.keyframes:
+            yield index
+        keyframes = set(self.keyframes)
+        for index in coarse_to_fine(self.total_frames, self.base_frames):
+            if index not in keyframes:
+                yield index
+
+    def confidence_interval(self, scores):
+        """Normal-approximation interval for the mean fake score"""
+        n = len(scores)
+        if n == 0:
+            return 0.5, 0.0, 1.0
+        mean = sum(scores) / n
+        if n == 1:
+            return mean, 0.0, 1.0
+        variance = sum((s - mean) ** 2 for s in scores) / (n - 1)
+        half_width = self.z_score * math.sqrt(variance / n)
+        return mean, max(0.0, mean - half_width), min(1.0, mean + half_width)
+
+    def run(self, score_frame):
+        """Score frames until the verdict is decisive or the budget is spent.
+
+        ``score_frame(index)`` returns ``(frame_result, fake_score)`` where
+        ``fake_score`` is in [0, 1], or None when the frame has no evidence
+        (for example no face was found). Returns ``(frame_results, report)``
+        with frame results in frame order.
+        """
+        start = time.perf_counter()
+        frame_results = []
+        scores = []
+        stop_reason = 'exhausted'
+
+        for index in self.frame_order():
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if len(frame_results) >= self.max_frames:
+                stop_reason = 'frame_budget'
+                break
+            if frame_results and elapsed_ms >= self.time_budget_ms:
+                stop_reason = 'time_budget'
+                break
+
+            frame_result, fake_score = score_frame(index)
+            frame_results.append(frame_result)
+            if fake_score is not None:
+                scores.append(fake_score)
+
+            if len(frame_results) >= self.base_frames and len(scores) >= 2:
+                _, low, high = self.confidence_interval(scores)
+                if low > 0.5 or high < 0.5:
+                    stop_reason = 'decisive'
+                    break
+
+        mean, low, high = self.confidence_interval(scores)
+        report = {
+            'total_frames': self.total_frames,
+            'frames_analyzed': len(frame_results),
+            'frames_with_evidence': len(scores),
+            'keyframes_available': len(self.keyframes),
+            'escalated': len(frame_results) > self.base_frames,
+            'stop_reason': stop_reason,
+            'mean_fake_score': mean,
+            'confidence_interval': [low, high],
+            'elapsed_ms': (time.perf_counter() - start) * 1000
+        }
+        frame_results.sort(key=lambda r: r.get('frame', 0))
+        return frame_results, report
@@ -0,0 +1,57 @@
+"""Gunicorn configuration: gunicorn -c gunicorn.conf.py wsgi:app
+
+Models are loaded in the master before forking (PRELOAD_MODELS=true) so the
+workers share read-only weights copy-on-write. Compute thread pools are sized
+so that workers x threads does not exceed the available cores.
+"""
+import os
+
+from config import Config
+
+cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', max(1, cpu_count // 2)))
+# Request threads per worker; they mostly wait on I/O and on the model. Up to
+# the sum of the admission limits plus ADMISSION_MAX_QUEUE (9 by default) can
+# sit inside admission at once, so keep a few threads beyond that for /health,
+# /login and status routes, which must answer even when analysis is saturated
+ADMISSION_THREADS = sum(Config.ADMISSION_CONCURRENCY.values()) + Config.ADMISSION_MAX_QUEUE
+threads = int(os.getenv('GUNICORN_THREADS', ADMISSION_THREADS + 4))
+if threads <= ADMISSION_THREADS:
+    print(f"Warning: GUNICORN_THREADS={threads} leaves no thread free once {ADMISSION_THREADS} "
+          f"are in admission; cheap routes can stall under load")
+worker_class = 'gthread'
+# Large uploads and model warm-up take longer than gunicorn's 30s default
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 300))
+preload_app = os.getenv('PRELOAD_MODELS', 'true').lower() == 'true'
+
+# TensorFlow/OpenCV/BLAS threads per worker, so all workers together use each core once
+compute_threads = int(os.getenv('WORKER_COMPUTE_THREADS', max(1, cpu_count // workers)))
+
+# Inherited by the workers; read by OpenMP/BLAS and TensorFlow at start-up
+os.environ['OMP_NUM_THREADS'] = str(compute_threads)
+os.environ['TF_NUM_INTRAOP_THREADS'] = str(compute_threads)
+os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+
+
+def post_fork(server, worker):
+    from detection import model_loader
+    from app.main import start_background_tasks
+
+    try:
+        model_loader.configure_threads(compute_threads)
+    except ImportError as e:
+        # Without TensorFlow/OpenCV the app still serves simulated analysis
+        server.log.warning(f"Worker {worker.pid}: not sizing compute threads: {e}")
+    start_background_tasks()
+    server.log.info(f"Worker {worker.pid}: {compute_threads} compute threads")
+
+
+def post_worker_init(worker):
+    from detection import model_loader
+
+    try:
+        model_loader.warm_up()
+    except ImportError as e:
+        worker.log.warning(f"Worker {worker.pid}: models not warmed up: {e}")
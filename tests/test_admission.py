@@ -0,0 +1,173 @@
+import threading
+import time
+
+import pytest
+
+from utils import admission
+from utils.admission import AdmissionController, AdmissionRejected, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission.time, 'monotonic', clock)
+    return clock
+
+
+def controller(**overrides):
+    options = dict(concurrency={'image': 1, 'video': 1}, max_queue=1, queue_timeout=5,
+                   user_rate=1.0, user_burst=2)
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def hold_slot(gate, media_type='image'):
+    """Occupy a slot from another thread until the returned event is set"""
+    entered, release = threading.Event(), threading.Event()
+
+    def run():
+        with gate.admit(media_type, 'holder', cost=0):
+            entered.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert entered.wait(5)
+    return release, thread
+
+
+def wait_for(predicate):
+    deadline = time.monotonic() + 5
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_token_bucket_burst_then_refill(clock):
+    bucket = TokenBucket(rate=0.5, burst=2)
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert bucket.take() == pytest.approx(2.0)
+    assert not bucket.is_full()
+
+    clock.now += 2
+    assert bucket.take() == 0
+    clock.now += 100
+    assert bucket.is_full()
+    assert bucket.tokens <= bucket.burst
+
+
+def test_quota_rejects_with_retry_after(clock):
+    gate = controller(user_rate=0.1)
+    for _ in range(2):
+        gate.check_quota('u1')
+
+    with pytest.raises(AdmissionRejected) as error:
+        gate.check_quota('u1')
+    assert (error.value.status, error.value.retry_after) == (429, 10)
+    # Another user has a bucket of their own
+    gate.check_quota('u2')
+    assert gate.stats()['rejected_quota'] == 1
+
+
+def test_zero_cost_skips_quota(clock):
+    gate = controller(user_burst=1)
+    gate.check_quota('u1')
+    gate.check_quota('u1', cost=0)
+    with gate.admit('image', 'u1', cost=0):
+        pass
+    with pytest.raises(AdmissionRejected):
+        gate.check_quota('u1')
+
+
+def test_unknown_media_type():
+    with pytest.raises(ValueError):
+        with controller().admit('pdf', 'u1'):
+            pass
+
+
+def test_slots_are_per_media_type():
+    gate = controller(max_queue=0)
+    release, thread = hold_slot(gate, 'video')
+    try:
+        with gate.admit('image', 'u1', cost=0):
+            stats = gate.stats()
+            assert (stats['image_active'], stats['video_active']) == (1, 1)
+    finally:
+        release.set()
+        thread.join()
+    assert gate.stats()['admitted'] == 2
+
+
+def test_full_queue_rejects_immediately():
+    gate = controller(max_queue=0)
+    release, thread = hold_slot(gate)
+    try:
+        with pytest.raises(AdmissionRejected) as error:
+            with gate.admit('image', 'u1', cost=0):
+                pass
+        assert error.value.status == 503
+        assert error.value.retry_after >= 1
+        assert gate.stats()['rejected_queue_full'] == 1
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_queued_job_times_out():
+    gate = controller(queue_timeout=0.05)
+    release, thread = hold_slot(gate)
+    try:
+        with pytest.raises(AdmissionRejected) as error:
+            with gate.admit('image', 'u1', cost=0):
+                pass
+        assert error.value.status == 503
+        stats = gate.stats()
+        assert (stats['rejected_timeout'], stats['waiting']) == (1, 0)
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_queued_job_runs_when_a_slot_frees():
+    gate = controller()
+    release, thread = hold_slot(gate)
+    admitted = threading.Event()
+
+    def waiter():
+        with gate.admit('image', 'u1', cost=0):
+            admitted.set()
+
+    queued = threading.Thread(target=waiter)
+    queued.start()
+    wait_for(lambda: gate.stats()['waiting'] == 1)
+    assert not admitted.is_set()
+
+    release.set()
+    queued.join(5)
+    thread.join()
+    assert admitted.is_set()
+    stats = gate.stats()
+    assert (stats['admitted'], stats['waiting'], stats['image_active']) == (2, 0, 0)
+
+
+def test_slot_is_released_when_the_job_fails():
+    gate = controller(max_queue=0)
+    with pytest.raises(RuntimeError):
+        with gate.admit('image', 'u1', cost=0):
+            raise RuntimeError('analysis failed')
+    with gate.admit('image', 'u1', cost=0):
+        assert gate.stats()['image_active'] == 1
+
+
+def test_retry_after_is_at_least_one_second():
+    assert AdmissionRejected('busy', 503, 0.01).retry_after == 1
+    assert AdmissionRejected('busy', 503, 2.1).retry_after == 3
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from utils.chunked_upload import ChunkedUploadError, ChunkedUploadManager
+
+CHUNK = 100
+
+
+def sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def chunks_of(data):
+    return [data[i:i + CHUNK] for i in range(0, len(data), CHUNK)]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ChunkedUploadManager(str(tmp_path / 'chunked'), chunk_size=CHUNK, max_size=10_000,
+                                session_ttl=60, max_sessions_per_user=2)
+
+
+def start(manager, data, user='u1'):
+    return manager.init_upload('clip.wav', len(data), user)['upload_id']
+
+
+def test_out_of_order_chunks_complete_with_whole_file_hash(manager):
+    data = os.urandom(350)
+    upload_id = start(manager, data)
+    parts = chunks_of(data)
+    for index in (3, 1, 0, 2):
+        manager.write_chunk(upload_id, index, parts[index], sha(parts[index]), 'u1')
+
+    data_path, filename, file_hash = manager.complete(upload_id, 'u1', expected_sha256=sha(data))
+    assert file_hash == sha(data)
+    assert filename == 'clip.wav'
+    with open(data_path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_resume_after_restart_hashes_from_disk(manager, tmp_path):
+    data = os.urandom(250)
+    upload_id = start(manager, data)
+    parts = chunks_of(data)
+    manager.write_chunk(upload_id, 0, parts[0], sha(parts[0]), 'u1')
+
+    # A new process has no running hasher; status tells the client what is left
+    restarted = ChunkedUploadManager(manager.root, CHUNK, 10_000, 60)
+    assert restarted.get_status(upload_id, 'u1')['received'] == [0]
+    for index in (1, 2):
+        restarted.write_chunk(upload_id, index, parts[index], sha(parts[index]), 'u1')
+    assert restarted.complete(upload_id, 'u1')[2] == sha(data)
+
+
+def test_incomplete_upload_lists_missing_chunks(manager):
+    data = os.urandom(300)
+    upload_id = start(manager, data)
+    part = chunks_of(data)[1]
+    manager.write_chunk(upload_id, 1, part, sha(part), 'u1')
+
+    with pytest.raises(ChunkedUploadError) as error:
+        manager.complete(upload_id, 'u1')
+    assert error.value.status == 409
+    assert '[0, 2]' in error.value.message
+
+
+@pytest.mark.parametrize('checksum, data, status', [
+    ('00' * 32, b'x' * CHUNK, 422),  # corrupted in transit
+    (None, b'x' * CHUNK, 400),       # no checksum header
+    (sha(b'x' * 10), b'x' * 10, 400)  # wrong length for the index
+])
+def test_bad_chunks_are_rejected(manager, checksum, data, status):
+    upload_id = start(manager, os.urandom(200))
+    with pytest.raises(ChunkedUploadError) as error:
+        manager.write_chunk(upload_id, 0, data, checksum, 'u1')
+    assert error.value.status == status
+    assert manager.get_status(upload_id, 'u1')['received'] == []
+
+
+def test_retried_chunk_is_idempotent_but_conflicting_content_is_not(manager):
+    data = os.urandom(200)
+    upload_id = start(manager, data)
+    part = chunks_of(data)[0]
+    manager.write_chunk(upload_id, 0, part, sha(part), 'u1')
+    assert manager.write_chunk(upload_id, 0, part, sha(part), 'u1')['received'] == [0]
+
+    other = os.urandom(CHUNK)
+    with pytest.raises(ChunkedUploadError) as error:
+        manager.write_chunk(upload_id, 0, other, sha(other), 'u1')
+    assert error.value.status == 409
+
+
+def test_whole_file_checksum_mismatch(manager):
+    data = os.urandom(100)
+    upload_id = start(manager, data)
+    manager.write_chunk(upload_id, 0, data, sha(data), 'u1')
+    with pytest.raises(ChunkedUploadError) as error:
+        manager.complete(upload_id, 'u1', expected_sha256='0' * 64)
+    assert error.value.status == 422
+
+
+def test_sessions_are_private_to_their_owner(manager):
+    upload_id = start(manager, os.urandom(100))
+    for call in (lambda: manager.get_status(upload_id, 'u2'),
+                 lambda: manager.get_status('not-a-uuid', 'u1')):
+        with pytest.raises(ChunkedUploadError) as error:
+            call()
+        assert error.value.status == 404
+
+
+@pytest.mark.parametrize('size, chunk_size, status', [
+    (True, None, 400),
+    (0, None, 400),
+    ('100', None, 400),
+    (100, True, 400),
+    (100, CHUNK + 1, 400),
+    (10_001, None, 413)
+])
+def test_init_validates_sizes(manager, size, chunk_size, status):
+    with pytest.raises(ChunkedUploadError) as error:
+        manager.init_upload('clip.wav', size, 'u1', chunk_size=chunk_size)
+    assert error.value.status == status
+
+
+def test_session_limit_per_user(manager):
+    start(manager, os.urandom(10))
+    start(manager, os.urandom(10))
+    with pytest.raises(ChunkedUploadError) as error:
+        start(manager, os.urandom(10))
+    assert error.value.status == 429
+    # Other users are not affected
+    start(manager, os.urandom(10), user='u2')
+
+
+def test_new_sessions_are_complete_on_disk(manager):
+    upload_id = start(manager, os.urandom(250))
+    session_dir = os.path.join(manager.root, upload_id)
+    with open(os.path.join(session_dir, 'meta.json')) as f:
+        assert json.load(f)['total_chunks'] == 3
+    assert os.path.getsize(os.path.join(session_dir, 'data.part')) == 250
+    assert not [name for name in os.listdir(manager.root) if name.endswith('.tmp')]
+
+
+def test_expiry_counts_from_last_accepted_chunk(manager):
+    active = start(manager, os.urandom(200))
+    idle = start(manager, os.urandom(200))
+    old = time.time() - 120
+    for upload_id in (active, idle):
+        os.utime(os.path.join(manager.root, upload_id, 'meta.json'), (old, old))
+
+    part = os.urandom(CHUNK)
+    manager.write_chunk(active, 0, part, sha(part), 'u1')
+    manager.cleanup_expired()
+
+    assert manager.get_status(active, 'u1')['received'] == [0]
+    with pytest.raises(ChunkedUploadError):
+        manager.get_status(idle, 'u1')
+
+
+def test_cleanup_prunes_hashers_and_staging_leftovers(manager):
+    data = os.urandom(200)
+    upload_id = start(manager, data)
+    part = chunks_of(data)[0]
+    manager.write_chunk(upload_id, 0, part, sha(part), 'u1')
+    assert upload_id in manager._hashers
+
+    stale_staging = os.path.join(manager.root, '.deadbeef.tmp')
+    os.makedirs(stale_staging)
+    old = time.time() - 120
+    os.utime(stale_staging, (old, old))
+
+    # Another worker expired the session
+    shutil.rmtree(os.path.join(manager.root, upload_id))
+    manager.cleanup_expired()
+    assert upload_id not in manager._hashers
+    assert not os.path.exists(stale_staging)
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from utils import evaluation
+from utils.evaluation import FeedbackMetrics, feedback_outcome
+
+
+def record(predicted, correct, confidence=90, media_type='image', version='v1', actual=None):
+    feedback = {'isCorrect': correct}
+    if actual is not None:
+        feedback['actualResult'] = actual
+    return {'type': media_type, 'aiPrediction': predicted, 'aiConfidence': confidence,
+            'userFeedback': feedback, 'modelVersion': version}
+
+
+def line(rec):
+    return (json.dumps(rec) + '\n').encode()
+
+
+def append(path, data):
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / 'feedback.jsonl'
+    path.write_bytes(b'')
+    return str(path)
+
+
+def test_feedback_outcome():
+    assert feedback_outcome(record(True, True, 80)) == (True, True, 0.8)
+    assert feedback_outcome(record(True, False, 0.3)) == (True, False, 0.3)
+    assert feedback_outcome(record(False, False, actual=False)) == (False, False, 0.9)
+    assert feedback_outcome(record(False, True, 250))[2] == 1.0
+    assert feedback_outcome({'aiPrediction': True, 'userFeedback': {}}) is None
+    assert feedback_outcome({'userFeedback': {'isCorrect': True}}) is None
+
+
+def test_update_reads_only_appended_lines(log_path):
+    metrics = FeedbackMetrics(log_path)
+    first = line(record(True, True)) + line(record(False, True, 10))
+    append(log_path, first)
+    assert metrics.update() == 2
+    assert metrics.offset == len(first)
+    assert metrics.update() == 0
+
+    append(log_path, line(record(True, False)) + b'not json\n' + line({'type': 'image'}))
+    assert metrics.update() == 1
+    summary = metrics.summary()
+    assert summary['records'] == 3
+    assert summary['groups'][0]['confusion_matrix'] == {'tp': 1, 'fp': 1, 'tn': 1, 'fn': 0}
+
+
+def test_partial_trailing_line_waits_for_its_newline(log_path):
+    metrics = FeedbackMetrics(log_path)
+    complete, partial = line(record(True, True)), line(record(False, True))
+    append(log_path, complete + partial[:20])
+    assert metrics.update() == 1
+    assert metrics.offset == len(complete)
+
+    append(log_path, partial[20:])
+    assert metrics.update() == 1
+    assert metrics.offset == len(complete + partial)
+
+
+def test_oversized_line_is_skipped(log_path, monkeypatch):
+    monkeypatch.setattr(evaluation, 'READ_CHUNK_SIZE', 150)
+    metrics = FeedbackMetrics(log_path)
+    data = line(record(True, True)) + b'x' * 400 + b'\n' + line(record(False, True))
+    append(log_path, data)
+    assert metrics.update() == 2
+    assert metrics.offset == len(data)
+
+
+def test_shrunk_log_is_recounted(log_path):
+    metrics = FeedbackMetrics(log_path)
+    append(log_path, line(record(True, True)) * 3)
+    assert metrics.update() == 3
+
+    with open(log_path, 'wb') as f:
+        f.write(line(record(False, True)))
+    assert metrics.update() == 1
+    assert metrics.summary()['records'] == 1
+
+
+def test_state_resumes_in_another_instance(log_path, tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    append(log_path, line(record(True, True)) + line(record(True, True, version='v2')))
+    assert FeedbackMetrics(log_path, state_path).update() == 2
+
+    # A restarted process, or another worker, continues from the saved offset
+    resumed = FeedbackMetrics(log_path, state_path)
+    assert resumed.update() == 0
+    append(log_path, line(record(True, True)))
+    assert resumed.update() == 1
+    other = FeedbackMetrics(log_path, state_path)
+    assert other.update() == 0
+    assert other.summary(model_version='v1')['records'] == 2
+
+    # State saved with different bins is ignored and the log recounted
+    assert FeedbackMetrics(log_path, state_path, bins=5).update() == 3
+
+
+def test_f1_is_zero_without_true_positives_and_none_without_data(log_path):
+    metrics = FeedbackMetrics(log_path)
+    append(log_path, line(record(True, False, media_type='audio')))       # fp
+    append(log_path, line(record(False, False, 10, media_type='audio')))  # fn
+    append(log_path, line(record(False, True, 10, media_type='video')))   # tn
+    metrics.update()
+
+    audio = metrics.summary(media_type='audio')['groups'][0]
+    assert (audio['precision'], audio['recall'], audio['f1']) == (0.0, 0.0, 0.0)
+    video = metrics.summary(media_type='video')['groups'][0]
+    assert (video['precision'], video['recall'], video['f1']) == (None, None, None)
+    assert video['accuracy'] == 1.0
+
+
+def test_calibration_bins(log_path):
+    metrics = FeedbackMetrics(log_path, bins=2)
+    append(log_path, line(record(True, True, 80)) + line(record(True, False, 60)))
+    metrics.update()
+
+    group = metrics.summary()['groups'][0]
+    low, high = group['calibration']
+    assert low['count'] == 0 and low['mean_confidence'] is None
+    assert high['count'] == 2
+    assert high['mean_confidence'] == pytest.approx(0.7)
+    assert high['observed_fake_rate'] == 0.5
+    assert group['expected_calibration_error'] == pytest.approx(0.2)
+
+
+def test_missing_log_adds_nothing(tmp_path):
+    assert FeedbackMetrics(str(tmp_path / 'missing.jsonl')).update() == 0
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from utils.storage import ContentStore, fcntl, hash_file
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentStore(str(tmp_path / 'objects'), max_age=60, max_bytes=10_000)
+
+
+def upload(tmp_path, data, name='upload.bin'):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def age(path, seconds):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def test_identical_uploads_share_one_object(store, tmp_path):
+    first, file_hash = store.put(upload(tmp_path, b'same', 'a.bin'), 'WAV')
+    second, _ = store.put(upload(tmp_path, b'same', 'b.bin'), 'wav')
+
+    assert first == second == store.path_for(file_hash, 'wav')
+    assert file_hash == hash_file(first)
+    assert not (tmp_path / 'b.bin').exists()
+    stats = store.stats()
+    assert (stats['objects'], stats['dedup_hits'], stats['objects_in_use']) == (1, 1, 1)
+
+
+def test_referenced_objects_survive_until_released(store, tmp_path):
+    path, _ = store.put(upload(tmp_path, b'a'), 'wav')
+    store.put(upload(tmp_path, b'a'), 'wav')
+    age(path, 120)
+
+    assert store.evict() == 0
+    store.release(path)
+    assert store.evict() == 0  # one reference is still held
+    store.release(path)
+    assert store.evict() == 1
+    assert not os.path.exists(path)
+    assert store.stats()['evictions_age'] == 1
+
+
+def test_quota_evicts_least_recently_used_first(tmp_path):
+    store = ContentStore(str(tmp_path / 'objects'), max_age=3600, max_bytes=250)
+    paths = []
+    for index, seconds in enumerate((30, 20, 10)):
+        path, _ = store.put(upload(tmp_path, bytes([index]) * 100), 'bin')
+        store.release(path)
+        age(path, seconds)
+        paths.append(path)
+
+    assert store.evict() == 1
+    assert [os.path.exists(path) for path in paths] == [False, True, True]
+    stats = store.stats()
+    assert (stats['evictions_quota'], stats['objects'], stats['bytes']) == (1, 2, 200)
+
+
+def test_quota_skips_objects_in_use(tmp_path):
+    store = ContentStore(str(tmp_path / 'objects'), max_age=3600, max_bytes=150)
+    held, _ = store.put(upload(tmp_path, b'h' * 100), 'bin')
+    age(held, 30)
+    free, _ = store.put(upload(tmp_path, b'f' * 100), 'bin')
+    store.release(free)
+
+    assert store.evict() == 1
+    assert os.path.exists(held) and not os.path.exists(free)
+
+
+def test_stats_reflect_existing_objects_at_startup(store, tmp_path):
+    for data in (b'one', b'three'):
+        store.release(store.put(upload(tmp_path, data), 'wav')[0])
+
+    restarted = ContentStore(store.root, store.max_age, store.max_bytes)
+    stats = restarted.stats()
+    assert (stats['objects'], stats['bytes'], stats['janitor_runs']) == (2, 8, 0)
+
+
+def test_release_of_unknown_object_is_ignored(store):
+    store.release(os.path.join(store.root, 'missing.wav'))
+    assert store.stats()['objects_in_use'] == 0
+
+
+@pytest.mark.skipif(fcntl is None, reason='cross-process locking needs fcntl')
+def test_other_process_cannot_evict_an_object_in_use(store, tmp_path):
+    path, _ = store.put(upload(tmp_path, b'busy'), 'wav')
+    age(path, 120)
+    janitor = (
+        'import sys; from utils.storage import ContentStore; '
+        'print(ContentStore(sys.argv[1], 60, 10_000).evict())'
+    )
+
+    def evict_elsewhere():
+        result = subprocess.run([sys.executable, '-c', janitor, store.root], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip().splitlines()[-1]
+
+    assert evict_elsewhere() == '0'
+    assert os.path.exists(path)
+    store.release(path)
+    assert evict_elsewhere() == '1'
+    assert not os.path.exists(path)
@@ -0,0 +1,208 @@
+"""Memory-mapped log-mel spectrogram store for audio training.
+
+``prepare_audio_features`` decodes every clip under ``AUDIO_DATA_DIR/{real,fake}``
+and computes its log-mel spectrogram in a process pool. All spectrograms are
+appended, time-major, to a single float16 file ``mels.f16`` of shape
+(total frames, n_mels); ``index.json`` records each clip's offset and length
+in frames. Re-runs only append clips that are not in the index yet; a store
+built with different spectrogram settings is rebuilt from scratch.
+
+``MelStore`` maps that file read-only. A window of consecutive frames of one
+clip is a contiguous slice, so ``window()`` returns a view into the mapping
+and nothing is decoded or copied until a batch is assembled.
+
+Usage: python -m training.data_prep.audio_data [DATA_DIR] [FEATURE_DIR]
+"""
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from configs.model_params import (
+    AUDIO_HOP_LENGTH, AUDIO_N_FFT, AUDIO_N_MELS, AUDIO_SAMPLE_RATE, AUDIO_WINDOW_FRAMES
+)
+from configs.paths import AUDIO_DATA_DIR, AUDIO_FEATURE_DIR
+from utils.file_utils import get_media_type
+
+LABELS = {'real': 0, 'fake': 1}
+INDEX_FILE = 'index.json'
+DATA_FILE = 'mels.f16'
+
+
+def list_clips(data_dir):
+    """(relative path, label) for every audio file under data_dir/real and data_dir/fake"""
+    clips = []
+    for name, label in LABELS.items():
+        for root, _, files in os.walk(os.path.join(data_dir, name)):
+            for filename in files:
+                if get_media_type(filename) == 'audio':
+                    path = os.path.join(root, filename)
+                    clips.append((os.path.relpath(path, data_dir), label))
+    return sorted(clips)
+
+
+def log_mel(path):
+    """(frames, n_mels) float16 log-mel spectrogram of a clip, resampled to mono AUDIO_SAMPLE_RATE"""
+    import librosa
+
+    samples, _ = librosa.load(path, sr=AUDIO_SAMPLE_RATE, mono=True)
+    mel = librosa.feature.melspectrogram(
+        y=samples, sr=AUDIO_SAMPLE_RATE, n_fft=AUDIO_N_FFT,
+        hop_length=AUDIO_HOP_LENGTH, n_mels=AUDIO_N_MELS)
+    # Time-major, so a window of frames is one contiguous block of the store
+    return np.ascontiguousarray(librosa.power_to_db(mel, ref=np.max).T, dtype=np.float16)
+
+
+def _extract(task):
+    relpath, path = task
+    try:
+        return relpath, log_mel(path)
+    except Exception as e:
+        print(f"Skipping {relpath}: {e}")
+        return relpath, None
+
+
+def spectrogram_settings():
+    """Settings the stored features depend on; a store built with others is stale"""
+    return {
+        'n_mels': AUDIO_N_MELS,
+        'sample_rate': AUDIO_SAMPLE_RATE,
+        'n_fft': AUDIO_N_FFT,
+        'hop_length': AUDIO_HOP_LENGTH
+    }
+
+
+def read_index(feature_dir):
+    path = os.path.join(feature_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return dict(spectrogram_settings(), frames=0, clips=[])
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_index(feature_dir, index):
+    path = os.path.join(feature_dir, INDEX_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(index, f)
+    os.replace(path + '.tmp', path)
+
+
+def prepare_audio_features(data_dir=AUDIO_DATA_DIR, feature_dir=AUDIO_FEATURE_DIR, workers=None):
+    """Append the log-mel spectrograms of clips not yet in the store. Returns the index."""
+    os.makedirs(feature_dir, exist_ok=True)
+    index = read_index(feature_dir)
+    settings = spectrogram_settings()
+    built_with = {key: index.get(key) for key in settings}
+    if built_with != settings:
+        print(f"Store was built with {built_with}, rebuilding for {settings}")
+        # Saved first: the data file is truncated to the index's frame count below
+        index = dict(settings, frames=0, clips=[])
+        write_index(feature_dir, index)
+
+    known = {clip['path'] for clip in index['clips']}
+    pending = [(relpath, label) for relpath, label in list_clips(data_dir) if relpath not in known]
+    print(f"{len(pending)} new clips, {len(known)} already in the store")
+    if not pending:
+        return index
+
+    labels = dict(pending)
+    data_path = os.path.join(feature_dir, DATA_FILE)
+    row_bytes = AUDIO_N_MELS * np.dtype(np.float16).itemsize
+    tasks = [(relpath, os.path.join(data_dir, relpath)) for relpath, _ in pending]
+
+    with open(data_path, 'ab') as data, Pool(workers) as pool:
+        # Drop a partial write left by an interrupted run; the index is the source of truth
+        data.truncate(index['frames'] * row_bytes)
+        for done, (relpath, mel) in enumerate(pool.imap_unordered(_extract, tasks, chunksize=8), 1):
+            if mel is None or not len(mel):
+                continue
+            data.write(mel.tobytes())
+            index['clips'].append({
+                'path': relpath,
+                'label': labels[relpath],
+                'offset': index['frames'],
+                'frames': len(mel)
+            })
+            index['frames'] += len(mel)
+            if done % 500 == 0:
+                print(f"   - {done}/{len(tasks)} clips")
+                data.flush()
+                write_index(feature_dir, index)
+
+    write_index(feature_dir, index)
+    seconds = index['frames'] * AUDIO_HOP_LENGTH / AUDIO_SAMPLE_RATE
+    print(f"{len(index['clips'])} clips, {seconds / 3600:.1f} hours of audio")
+    return index
+
+
+class MelStore:
+    """Read-only memory map of the spectrogram store with its offset index"""
+
+    def __init__(self, feature_dir=AUDIO_FEATURE_DIR, clips=None):
+        index = read_index(feature_dir)
+        self.n_mels = index['n_mels']
+        entries = index['clips'] if clips is None else [index['clips'][i] for i in clips]
+        self.paths = [clip['path'] for clip in entries]
+        self.offsets = np.array([clip['offset'] for clip in entries], dtype=np.int64)
+        self.lengths = np.array([clip['frames'] for clip in entries], dtype=np.int64)
+        self.labels = np.array([clip['label'] for clip in entries], dtype=np.float32)
+        self.mels = np.memmap(os.path.join(feature_dir, DATA_FILE), dtype=np.float16, mode='r',
+                              shape=(index['frames'], self.n_mels)) if index['frames'] else None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def clip(self, i):
+        """Full spectrogram of clip ``i`` as a view into the mapping"""
+        return self.mels[self.offsets[i]:self.offsets[i] + self.lengths[i]]
+
+    def window(self, i, start, length):
+        """``length`` frames of clip ``i`` from ``start``; a view unless the clip is shorter than ``length``"""
+        frames = self.clip(i)[start:start + length]
+        if len(frames) < length:
+            # Only clips shorter than a window are copied, padded with the quietest value
+            padded = np.full((length, self.n_mels), frames.min() if len(frames) else 0, dtype=np.float16)
+            padded[:len(frames)] = frames
+            return padded
+        return frames
+
+    def random_windows(self, length=AUDIO_WINDOW_FRAMES, seed=None):
+        """Endless (window, label) pairs: a random clip, then a random window within it"""
+        # Checked here rather than in the generator so the error surfaces at
+        # the call, not on the first batch tf.data pulls
+        if not len(self):
+            raise ValueError('MelStore has no clips to sample windows from; run training.data_prep.audio_data first')
+        rng = np.random.default_rng(seed)
+
+        def generate():
+            while True:
+                i = rng.integers(len(self))
+                start = rng.integers(max(self.lengths[i] - length, 0) + 1)
+                yield self.window(i, start, length), self.labels[i]
+
+        return generate()
+
+    def batches(self, batch_size=32, length=AUDIO_WINDOW_FRAMES, seed=None):
+        """Endless (float32 (batch, length, n_mels, 1), labels) batches of random windows"""
+        windows = self.random_windows(length, seed)
+        while True:
+            x = np.empty((batch_size, length, self.n_mels, 1), dtype=np.float32)
+            y = np.empty(batch_size, dtype=np.float32)
+            for row in range(batch_size):
+                window, y[row] = next(windows)
+                x[row, :, :, 0] = window
+            yield x, y
+
+
+def split_clips(feature_dir=AUDIO_FEATURE_DIR, val_fraction=0.1, seed=0):
+    """Clip positions in the index for a random train/val split"""
+    count = len(read_index(feature_dir)['clips'])
+    order = np.random.default_rng(seed).permutation(count)
+    n_val = int(count * val_fraction)
+    return sorted(order[n_val:].tolist()), sorted(order[:n_val].tolist())
+
+
+if __name__ == '__main__':
+    prepare_audio_features(*sys.argv[1:3])
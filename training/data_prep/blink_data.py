@@ -0,0 +1,192 @@
+"""Landmark and EAR feature cache for blink training.
+
+``prepare_blink_features`` runs dlib face detection and the 68-point landmark
+predictor over every frame of the videos in ``BLINK_DATA_DIR/{real,fake}``,
+once per video, in a process pool. Results are stored per video as a columnar
+``<sha256>.npz`` with one row per frame:
+
+    frame      int32    frame index
+    face       bool     whether a face was found
+    landmarks  int16    (frames, 68, 2), zeros where no face was found
+    left_ear   float32  NaN where no face was found
+    right_ear  float32
+    ear        float32  mean of both eyes
+
+``index.json`` maps video hashes to label, fps and frame counts, and remembers
+the hash of each source path by size and mtime, so re-runs only process new or
+changed videos. Training and threshold tuning read these files instead of
+re-running dlib.
+
+Usage: python -m training.data_prep.blink_data [DATA_DIR] [FEATURE_DIR]
+"""
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from configs.paths import BLINK_DATA_DIR, BLINK_FEATURE_DIR
+from utils.file_utils import get_media_type
+from utils.storage import hash_file
+
+LABELS = {'real': 0, 'fake': 1}
+INDEX_FILE = 'index.json'
+
+_analyzer = None
+
+
+def list_videos(data_dir):
+    """(relative path, label) for every video under data_dir/real and data_dir/fake"""
+    videos = []
+    for name, label in LABELS.items():
+        for root, _, files in os.walk(os.path.join(data_dir, name)):
+            for filename in files:
+                if get_media_type(filename) == 'video':
+                    path = os.path.join(root, filename)
+                    videos.append((os.path.relpath(path, data_dir), label))
+    return sorted(videos)
+
+
+def _init_worker():
+    global _analyzer
+    import cv2
+    from detection.blink_analysis import BlinkAnalyzer
+
+    cv2.setNumThreads(1)
+    _analyzer = BlinkAnalyzer()
+
+
+def extract_video_features(task):
+    """Worker: (video hash, fps, per-frame landmarks and EAR) of one video; features are None if it failed"""
+    path, video_hash = task
+    try:
+        return (video_hash,) + _video_features(path)
+    except Exception as e:
+        # One unreadable video must not abort the pool and the finished work
+        print(f"Skipping {path}: {e}")
+        return video_hash, 0.0, None
+
+
+def _video_features(path):
+    import cv2
+    from detection.blink_analysis import LEFT_EYE, RIGHT_EYE, eye_aspect_ratios
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    landmarks = []
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            landmarks.append(_analyzer.landmarks(frame))
+    finally:
+        cap.release()
+
+    count = len(landmarks)
+    face = np.array([points is not None for points in landmarks], dtype=bool)
+    stacked = np.zeros((count, 68, 2), dtype=np.int16)
+    if face.any():
+        stacked[face] = np.stack([points for points in landmarks if points is not None])
+
+    left_ear = np.full(count, np.nan, dtype=np.float32)
+    right_ear = np.full(count, np.nan, dtype=np.float32)
+    left_ear[face] = eye_aspect_ratios(stacked[face][:, LEFT_EYE])
+    right_ear[face] = eye_aspect_ratios(stacked[face][:, RIGHT_EYE])
+
+    features = {
+        'frame': np.arange(count, dtype=np.int32),
+        'face': face,
+        'landmarks': stacked,
+        'left_ear': left_ear,
+        'right_ear': right_ear,
+        'ear': (left_ear + right_ear) / 2
+    }
+    return fps, features
+
+
+def read_index(feature_dir):
+    path = os.path.join(feature_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {'videos': {}, 'paths': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_index(feature_dir, index):
+    path = os.path.join(feature_dir, INDEX_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _source_hash(index, data_dir, relpath):
+    """Hash of a source file, reused from the index while its size and mtime are unchanged"""
+    stat = os.stat(os.path.join(data_dir, relpath))
+    known = index['paths'].get(relpath)
+    if known and known['size'] == stat.st_size and known['mtime'] == stat.st_mtime:
+        return known['hash']
+    video_hash = hash_file(os.path.join(data_dir, relpath))
+    index['paths'][relpath] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': video_hash}
+    return video_hash
+
+
+def prepare_blink_features(data_dir=BLINK_DATA_DIR, feature_dir=BLINK_FEATURE_DIR, workers=None):
+    """Extract landmarks and EAR for every video not yet in the feature store.
+
+    Videos are keyed by content hash, so renamed or duplicated files are not
+    processed twice. Returns the index.
+    """
+    os.makedirs(feature_dir, exist_ok=True)
+    index = read_index(feature_dir)
+
+    tasks, labels = [], {}
+    for relpath, label in list_videos(data_dir):
+        video_hash = _source_hash(index, data_dir, relpath)
+        if video_hash not in index['videos'] and video_hash not in labels:
+            labels[video_hash] = (relpath, label)
+            tasks.append((os.path.join(data_dir, relpath), video_hash))
+    print(f"{len(tasks)} new videos, {len(index['videos'])} already in the feature store")
+
+    if tasks:
+        with Pool(workers, initializer=_init_worker) as pool:
+            for done, (video_hash, fps, features) in enumerate(pool.imap_unordered(extract_video_features, tasks), 1):
+                if features is None:
+                    continue
+                path = os.path.join(feature_dir, f'{video_hash}.npz')
+                # np.savez appends .npz to names without it
+                np.savez(path + '.tmp.npz', **features)
+                os.replace(path + '.tmp.npz', path)
+
+                relpath, label = labels[video_hash]
+                index['videos'][video_hash] = {
+                    'path': relpath,
+                    'label': label,
+                    'fps': fps,
+                    'frames': int(len(features['frame'])),
+                    'face_frames': int(features['face'].sum())
+                }
+                # Save progress regularly so an interrupted run resumes where it stopped
+                if done % 10 == 0:
+                    print(f"   - {done}/{len(tasks)} videos")
+                    write_index(feature_dir, index)
+
+    write_index(feature_dir, index)
+    return index
+
+
+def load_features(feature_dir=BLINK_FEATURE_DIR, columns=('ear',)):
+    """Yield (video_hash, info, {column: array}) for every video in the store.
+
+    Only the requested columns are read from each .npz, so tuning on the EAR
+    series never loads the landmark arrays.
+    """
+    index = read_index(feature_dir)
+    for video_hash, info in sorted(index['videos'].items()):
+        with np.load(os.path.join(feature_dir, f'{video_hash}.npz')) as data:
+            yield video_hash, info, {column: data[column] for column in columns}
+
+
+if __name__ == '__main__':
+    prepare_blink_features(*sys.argv[1:3])
@@ -0,0 +1,275 @@
+"""Face crop dataset: detect and crop faces once, then stream the crops.
+
+``prepare_face_data`` runs Haar face detection over ``FACE_DATA_DIR/{real,fake}``
+(images or videos) in a process pool and writes the 256x256 crops to sharded
+NumPy files with an ``index.json``. ``make_dataset`` streams those shards into
+a ``tf.data`` pipeline, so training epochs never touch the raw media again.
+
+Usage: python -m training.data_prep.face_data [DATA_DIR] [SHARD_DIR]
+"""
+import hashlib
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import Config
+from configs.model_params import FACE_INPUT_SIZE
+from configs.paths import FACE_DATA_DIR, FACE_SHARD_DIR
+from utils.file_utils import get_media_type
+
+LABELS = {'real': 0, 'fake': 1}
+INDEX_FILE = 'index.json'
+
+_cascade = None
+
+
+def list_sources(data_dir):
+    """(relative path, label) for every image and video under data_dir/real and data_dir/fake"""
+    sources = []
+    for name, label in LABELS.items():
+        folder = os.path.join(data_dir, name)
+        for root, _, files in os.walk(folder):
+            for filename in sorted(files):
+                if get_media_type(filename) in ('image', 'video'):
+                    path = os.path.join(root, filename)
+                    sources.append((os.path.relpath(path, data_dir), label))
+    return sorted(sources)
+
+
+def assign_split(relpath, val_fraction):
+    """Stable train/val split per source, so frames of one video never end up in both"""
+    bucket = int(hashlib.md5(relpath.encode()).hexdigest(), 16) % 1000
+    return 'val' if bucket < val_fraction * 1000 else 'train'
+
+
+def _init_worker():
+    global _cascade
+    import cv2
+    from utils.image_utils import load_face_cascade
+
+    # One process per core already; nested OpenCV threads only contend
+    cv2.setNumThreads(1)
+    _cascade = load_face_cascade()
+
+
+def extract_crops(task):
+    """Worker: face crops of one image, or of evenly spaced frames of one video"""
+    from utils.image_utils import crop_faces, load_image
+    from utils.video_utils import read_frames_seek
+
+    path, relpath, frames_per_video = task
+    crops = []
+    try:
+        if get_media_type(path) == 'image':
+            # Same decode size as process_image, so training crops match inference
+            frames = [load_image(path, Config.IMAGE_ANALYSIS_MAX_SIDE, Config.IMAGE_MAX_PIXELS)[0]]
+        else:
+            import cv2
+
+            cap = cv2.VideoCapture(path)
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            indices = np.linspace(0, max(total - 1, 0), frames_per_video).astype(int)
+            _, frames = read_frames_seek(path, indices)
+        for frame in frames:
+            crops.extend(crop_faces(frame, _cascade, FACE_INPUT_SIZE))
+    except Exception as e:
+        print(f"Skipping {relpath}: {e}")
+
+    height, width = FACE_INPUT_SIZE[1], FACE_INPUT_SIZE[0]
+    if not crops:
+        return relpath, np.empty((0, height, width, 3), dtype=np.uint8)
+    return relpath, np.stack(crops)
+
+
+class ShardWriter:
+    """Buffers crops of one split and writes them as fixed-size .npy shards"""
+
+    def __init__(self, out_dir, split, shard_size, first_shard=0, seed=0):
+        self.out_dir = out_dir
+        self.split = split
+        self.shard_size = shard_size
+        self.next_shard = first_shard
+        self.rng = np.random.default_rng(seed + first_shard)
+        self.images = []
+        self.labels = []
+        self.buffered = 0
+        self.shards = []
+
+    def add(self, crops, label):
+        if len(crops):
+            self.images.append(crops)
+            self.labels.append(np.full(len(crops), label, dtype=np.uint8))
+            self.buffered += len(crops)
+        while self.buffered >= self.shard_size:
+            self._write(self.shard_size)
+
+    def close(self):
+        if self.buffered:
+            self._write(self.buffered)
+        return self.shards
+
+    def _write(self, count):
+        images = np.concatenate(self.images)
+        labels = np.concatenate(self.labels)
+        self.images, self.labels = [images[count:]], [labels[count:]]
+        self.buffered -= count
+
+        # Frames of one video are near-duplicates; spread them over the shard
+        order = self.rng.permutation(count)
+        name = f'{self.split}-{self.next_shard:05d}'
+        self.next_shard += 1
+        out = np.lib.format.open_memmap(
+            os.path.join(self.out_dir, f'{name}.images.npy'), mode='w+',
+            dtype=np.uint8, shape=images[:count].shape)
+        out[:] = images[:count][order]
+        out.flush()
+        del out
+        np.save(os.path.join(self.out_dir, f'{name}.labels.npy'), labels[:count][order])
+
+        self.shards.append({
+            'split': self.split,
+            'images': f'{name}.images.npy',
+            'labels': f'{name}.labels.npy',
+            'count': int(count),
+            'fake': int(labels[:count].sum())
+        })
+
+
+def read_index(shard_dir):
+    path = os.path.join(shard_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {'crop_size': list(FACE_INPUT_SIZE), 'shards': [], 'sources': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_index(shard_dir, index):
+    path = os.path.join(shard_dir, INDEX_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def prepare_face_data(data_dir=FACE_DATA_DIR, shard_dir=FACE_SHARD_DIR, frames_per_video=16,
+                      shard_size=1024, val_fraction=0.1, workers=None):
+    """Detect and crop faces once and write them to sharded .npy files.
+
+    Sources already listed in the index are skipped, so adding media and
+    re-running only processes the new files into new shards. Delete
+    ``shard_dir`` to rebuild from scratch. Returns the index.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    index = read_index(shard_dir)
+    if index['crop_size'] != list(FACE_INPUT_SIZE):
+        raise ValueError(f"{shard_dir} holds {index['crop_size']} crops, expected {list(FACE_INPUT_SIZE)}")
+
+    pending = [(relpath, label) for relpath, label in list_sources(data_dir) if relpath not in index['sources']]
+    print(f"{len(pending)} new sources, {len(index['sources'])} already prepared")
+    if not pending:
+        return index
+
+    labels = dict(pending)
+    writers = {}
+    for split in ('train', 'val'):
+        existing = [s for s in index['shards'] if s['split'] == split]
+        writers[split] = ShardWriter(shard_dir, split, shard_size, first_shard=len(existing))
+
+    tasks = [(os.path.join(data_dir, relpath), relpath, frames_per_video) for relpath, _ in pending]
+    with Pool(workers, initializer=_init_worker) as pool:
+        for done, (relpath, crops) in enumerate(pool.imap_unordered(extract_crops, tasks, chunksize=4), 1):
+            split = assign_split(relpath, val_fraction)
+            writers[split].add(crops, labels[relpath])
+            index['sources'][relpath] = {'label': labels[relpath], 'split': split, 'crops': len(crops)}
+            if done % 100 == 0:
+                print(f"   - {done}/{len(tasks)} sources")
+
+    for writer in writers.values():
+        index['shards'].extend(writer.close())
+    write_index(shard_dir, index)
+
+    for split in ('train', 'val'):
+        count = sum(s['count'] for s in index['shards'] if s['split'] == split)
+        print(f"{split}: {count} crops")
+    return index
+
+
+class FaceShards:
+    """Memory-mapped view of the shards of one split"""
+
+    def __init__(self, shard_dir=FACE_SHARD_DIR, split='train'):
+        index = read_index(shard_dir)
+        self.shards = [s for s in index['shards'] if s['split'] == split]
+        self.crop_size = tuple(index['crop_size'])
+        self.images = [np.load(os.path.join(shard_dir, s['images']), mmap_mode='r') for s in self.shards]
+        self.labels = [np.load(os.path.join(shard_dir, s['labels'])) for s in self.shards]
+
+    def __len__(self):
+        return sum(s['count'] for s in self.shards)
+
+    def read_block(self, shard, start, count):
+        """Copy ``count`` crops of one shard out of the mapping"""
+        end = start + count
+        return np.array(self.images[shard][start:end]), self.labels[shard][start:end].astype(np.float32)
+
+
+def make_dataset(shard_dir=FACE_SHARD_DIR, split='train', batch_size=32, shuffle=True,
+                 cache=None, augment=False, block_size=64, cycle_length=4, shuffle_buffer=2048):
+    """tf.data pipeline of (image, label) batches from prepared shards.
+
+    Shards are read in blocks of ``block_size`` crops, ``cycle_length`` shards
+    at a time with parallel interleave, and batches are prefetched. ``cache``
+    keeps the uint8 crops after the first epoch: ``''`` in memory, a path for
+    a cache file on local disk (useful when the shards live on slow storage).
+    """
+    import tensorflow as tf
+
+    shards = FaceShards(shard_dir, split)
+    if not shards.shards:
+        raise ValueError(f"No {split} shards in {shard_dir}, run face_data.py first")
+    width, height = shards.crop_size
+    counts = tf.constant([s['count'] for s in shards.shards], dtype=tf.int64)
+
+    def read_block(shard, start):
+        images, labels = tf.numpy_function(
+            lambda s, b: shards.read_block(int(s), int(b), block_size),
+            [shard, start], [tf.uint8, tf.float32])
+        images.set_shape([None, height, width, 3])
+        labels.set_shape([None])
+        return tf.data.Dataset.from_tensor_slices((images, labels))
+
+    def shard_blocks(shard):
+        starts = tf.data.Dataset.range(0, counts[shard], block_size)
+        return starts.flat_map(lambda start: read_block(shard, start))
+
+    dataset = tf.data.Dataset.range(len(shards.shards))
+    if shuffle:
+        dataset = dataset.shuffle(len(shards.shards), reshuffle_each_iteration=True)
+    dataset = dataset.interleave(
+        shard_blocks, cycle_length=cycle_length, block_length=block_size,
+        num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+
+    if cache is not None:
+        dataset = dataset.cache(cache)
+    if shuffle:
+        dataset = dataset.shuffle(shuffle_buffer)
+
+    def to_float(image, label):
+        image = tf.cast(image, tf.float32) / 255.0
+        if augment:
+            image = tf.image.random_flip_left_right(image)
+        return image, label
+
+    return (
+        dataset
+        .map(to_float, num_parallel_calls=tf.data.AUTOTUNE)
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
+
+if __name__ == '__main__':
+    prepare_face_data(*sys.argv[1:3])
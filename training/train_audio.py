@@ -0,0 +1,81 @@
+"""Train the audio deepfake classifier on the log-mel spectrogram store.
+
+Run ``python -m training.data_prep.audio_data`` first; training reads random
+fixed-length windows straight from the memory-mapped store, so no audio is
+decoded during an epoch.
+
+Usage: python -m training.train_audio [--epochs N] [--steps N] [--batch-size N]
+"""
+import argparse
+import os
+
+from configs.model_params import AUDIO_N_MELS, AUDIO_WINDOW_FRAMES
+from configs.paths import AUDIO_FEATURE_DIR, AUDIO_MODEL_PATH
+from training.data_prep.audio_data import MelStore, split_clips
+
+
+def build_model(window=AUDIO_WINDOW_FRAMES, n_mels=AUDIO_N_MELS):
+    from tensorflow.keras import layers, models
+
+    inputs = layers.Input(shape=(window, n_mels, 1))
+    x = layers.BatchNormalization()(inputs)
+    for filters in (32, 64, 128):
+        x = layers.Conv2D(filters, 3, padding='same', activation='relu')(x)
+        x = layers.MaxPooling2D()(x)
+    x = layers.GlobalAveragePooling2D()(x)
+    x = layers.Dropout(0.3)(x)
+    outputs = layers.Dense(1, activation='sigmoid')(x)
+
+    model = models.Model(inputs, outputs)
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy', 'AUC'])
+    return model
+
+
+def make_dataset(store, batch_size, window, seed=None):
+    import tensorflow as tf
+
+    return tf.data.Dataset.from_generator(
+        lambda: store.batches(batch_size, window, seed),
+        output_signature=(
+            tf.TensorSpec((batch_size, window, store.n_mels, 1), tf.float32),
+            tf.TensorSpec((batch_size,), tf.float32)
+        )
+    ).prefetch(tf.data.AUTOTUNE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--features', default=AUDIO_FEATURE_DIR)
+    parser.add_argument('--output', default=AUDIO_MODEL_PATH)
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=500, help='Batches per epoch')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--window', type=int, default=AUDIO_WINDOW_FRAMES, help='Spectrogram frames per window')
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    train_clips, val_clips = split_clips(args.features)
+    train = MelStore(args.features, train_clips)
+    val = MelStore(args.features, val_clips)
+    print(f"{len(train)} training and {len(val)} validation clips")
+    if not len(train):
+        parser.error(f"No training clips in {args.features}; run python -m training.data_prep.audio_data first")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    model = build_model(args.window, train.n_mels)
+    model.fit(
+        make_dataset(train, args.batch_size, args.window),
+        steps_per_epoch=args.steps,
+        # A fixed seed validates on the same windows every epoch
+        validation_data=make_dataset(val, args.batch_size, args.window, seed=0) if len(val) else None,
+        validation_steps=max(args.steps // 10, 1),
+        epochs=args.epochs,
+        callbacks=[tf.keras.callbacks.ModelCheckpoint(
+            args.output, monitor='val_loss' if len(val) else 'loss', save_best_only=True)]
+    )
+    print(f"Saved audio model to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Tune blink parameters and train the blink model from the landmark/EAR cache.
+
+Run ``python -m training.data_prep.blink_data`` first; nothing here runs dlib.
+
+``--tune`` grid-searches ``BLINK_EAR_THRESHOLD`` and ``BLINK_CONSEC_FRAMES``
+for the blink rate that best separates real from fake videos (deepfakes tend
+to blink less). Without it, a small 1D CNN is trained on fixed-length windows
+of the per-frame EAR series and saved to ``BLINK_MODEL_PATH``.
+
+Usage: python -m training.train_blink [--tune] [--epochs N] [--window N]
+"""
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from configs.paths import BLINK_FEATURE_DIR, BLINK_MODEL_PATH
+from training.data_prep.blink_data import load_features
+
+DEFAULT_FPS = 30.0
+
+
+def closed_run_lengths(ear, threshold):
+    """Lengths of the runs of consecutive frames with EAR below ``threshold``"""
+    below = np.zeros(len(ear) + 2, dtype=np.int8)
+    below[1:-1] = ear < threshold  # NaN (no face) compares False
+    edges = np.diff(below)
+    return np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+
+def roc_auc(scores, labels):
+    """Probability that a random positive scores above a random negative (ties count half)"""
+    scores, labels = np.asarray(scores, dtype=np.float64), np.asarray(labels, dtype=bool)
+    positives, negatives = labels.sum(), (~labels).sum()
+    if not positives or not negatives:
+        return float('nan')
+    order = np.argsort(scores, kind='mergesort')
+    ranks = np.empty(len(scores))
+    ranks[order] = np.arange(1, len(scores) + 1)
+    # Average the ranks of tied scores
+    _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+    ranks = np.bincount(inverse, ranks)[inverse] / counts[inverse]
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def tune_blink_params(feature_dir=BLINK_FEATURE_DIR, thresholds=None, consec_frames=range(1, 7)):
+    """Score every (threshold, consecutive frames) pair by how well the blink rate separates real from fake.
+
+    Returns a list of dicts sorted best first.
+    """
+    if thresholds is None:
+        thresholds = np.round(np.arange(0.12, 0.32, 0.01), 2)
+
+    series, minutes, is_real = [], [], []
+    for _, info, columns in load_features(feature_dir, columns=('ear',)):
+        series.append(columns['ear'])
+        minutes.append(max(info['frames'], 1) / (info['fps'] or DEFAULT_FPS) / 60)
+        is_real.append(info['label'] == 0)
+    if not series:
+        raise ValueError(f"No features in {feature_dir}, run blink_data.py first")
+    minutes = np.array(minutes)
+
+    results = []
+    for threshold in thresholds:
+        runs = [closed_run_lengths(ear, threshold) for ear in series]
+        for consec in consec_frames:
+            rates = np.array([(lengths >= consec).sum() for lengths in runs]) / minutes
+            results.append({
+                'threshold': float(threshold),
+                'consec_frames': int(consec),
+                'auc': roc_auc(rates, is_real),
+                'real_blinks_per_minute': float(np.median(rates[is_real])) if any(is_real) else None,
+                'fake_blinks_per_minute': float(np.median(rates[~np.array(is_real)])) if not all(is_real) else None
+            })
+    return sorted(results, key=lambda r: -np.nan_to_num(r['auc']))
+
+
+def fill_missing(values):
+    """Linearly interpolate NaN gaps (frames without a face); all-NaN becomes zeros"""
+    values = values.astype(np.float32)
+    missing = np.isnan(values)
+    if missing.all():
+        return np.zeros_like(values)
+    if missing.any():
+        index = np.arange(len(values))
+        values[missing] = np.interp(index[missing], index[~missing], values[~missing])
+    return values
+
+
+def make_windows(feature_dir=BLINK_FEATURE_DIR, window=90, stride=45, val_fraction=0.1):
+    """(left EAR, right EAR, face present) windows per split, labelled with the video's label"""
+    splits = {'train': ([], []), 'val': ([], [])}
+    for video_hash, info, columns in load_features(feature_dir, columns=('left_ear', 'right_ear', 'face')):
+        features = np.stack([
+            fill_missing(columns['left_ear']),
+            fill_missing(columns['right_ear']),
+            columns['face'].astype(np.float32)
+        ], axis=-1)
+        if len(features) < window:
+            continue
+        starts = range(0, len(features) - window + 1, stride)
+        bucket = int(hashlib.md5(video_hash.encode()).hexdigest(), 16) % 1000
+        windows, labels = splits['val' if bucket < val_fraction * 1000 else 'train']
+        windows.extend(features[start:start + window] for start in starts)
+        labels.extend([float(info['label'])] * len(starts))
+
+    return {
+        split: (np.stack(windows) if windows else np.empty((0, window, 3), np.float32), np.array(labels, np.float32))
+        for split, (windows, labels) in splits.items()
+    }
+
+
+def build_model(window):
+    from tensorflow.keras import layers, models
+
+    inputs = layers.Input(shape=(window, 3))
+    x = inputs
+    for filters in (32, 64):
+        x = layers.Conv1D(filters, 5, padding='same', activation='relu')(x)
+        x = layers.MaxPooling1D()(x)
+    x = layers.GlobalAveragePooling1D()(x)
+    outputs = layers.Dense(1, activation='sigmoid')(x)
+
+    model = models.Model(inputs, outputs)
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy', 'AUC'])
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--features', default=BLINK_FEATURE_DIR)
+    parser.add_argument('--output', default=BLINK_MODEL_PATH)
+    parser.add_argument('--tune', action='store_true', help='Tune the EAR threshold instead of training')
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--window', type=int, default=90, help='Frames per training window')
+    args = parser.parse_args()
+
+    if args.tune:
+        start = time.perf_counter()
+        results = tune_blink_params(args.features)
+        print(f"{len(results)} parameter pairs scored in {time.perf_counter() - start:.2f}s\n")
+        print(f"{'threshold':>10}{'consec':>8}{'auc':>8}{'real/min':>10}{'fake/min':>10}")
+        for r in results[:10]:
+            print(f"{r['threshold']:>10.2f}{r['consec_frames']:>8}{r['auc']:>8.3f}"
+                  f"{r['real_blinks_per_minute'] or 0:>10.1f}{r['fake_blinks_per_minute'] or 0:>10.1f}")
+        best = results[0]
+        print(f"\nBLINK_EAR_THRESHOLD={best['threshold']}\nBLINK_CONSEC_FRAMES={best['consec_frames']}")
+        return
+
+    import tensorflow as tf
+
+    data = make_windows(args.features, window=args.window, stride=args.window // 2)
+    (x_train, y_train), (x_val, y_val) = data['train'], data['val']
+    print(f"{len(x_train)} training and {len(x_val)} validation windows")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    model = build_model(args.window)
+    model.fit(
+        x_train, y_train,
+        validation_data=(x_val, y_val) if len(x_val) else None,
+        epochs=args.epochs,
+        batch_size=64,
+        shuffle=True,
+        callbacks=[tf.keras.callbacks.ModelCheckpoint(
+            args.output, monitor='val_loss' if len(x_val) else 'loss', save_best_only=True)]
+    )
+    print(f"Saved blink model to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Train the face manipulation classifier on prepared face crops.
+
+Run ``python -m training.data_prep.face_data`` first; this script only reads
+the shards it writes. The model takes 256x256 BGR crops scaled to [0, 1] and
+outputs the probability that a face is fake, matching what
+detection/face_analysis.py feeds it.
+
+Usage: python -m training.train_face [--epochs N] [--batch-size N] [--cache PATH]
+"""
+import argparse
+import os
+
+from configs.model_params import FACE_INPUT_SIZE
+from configs.paths import FACE_MODEL_PATH, FACE_SHARD_DIR
+from training.data_prep.face_data import make_dataset
+
+
+def build_model():
+    from tensorflow.keras import layers, models
+
+    width, height = FACE_INPUT_SIZE
+    inputs = layers.Input(shape=(height, width, 3))
+    x = inputs
+    for filters in (32, 64, 128, 256):
+        x = layers.Conv2D(filters, 3, padding='same', use_bias=False)(x)
+        x = layers.BatchNormalization()(x)
+        x = layers.ReLU()(x)
+        x = layers.MaxPooling2D()(x)
+    x = layers.GlobalAveragePooling2D()(x)
+    x = layers.Dropout(0.3)(x)
+    outputs = layers.Dense(1, activation='sigmoid')(x)
+
+    model = models.Model(inputs, outputs)
+    model.compile(optimizer='adam', loss='binary_crossentropy',
+                  metrics=['accuracy', 'AUC'])
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shards', default=FACE_SHARD_DIR)
+    parser.add_argument('--output', default=FACE_MODEL_PATH)
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--cache', default=None,
+                        help="Cache decoded crops after the first epoch: '' for memory or a file path")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    train = make_dataset(args.shards, 'train', args.batch_size, shuffle=True, cache=args.cache, augment=True)
+    val = make_dataset(args.shards, 'val', args.batch_size, shuffle=False)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    model = build_model()
+    model.fit(
+        train,
+        validation_data=val,
+        epochs=args.epochs,
+        callbacks=[
+            tf.keras.callbacks.ModelCheckpoint(args.output, monitor='val_loss', save_best_only=True),
+            tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)
+        ]
+    )
+    print(f"Saved face model to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
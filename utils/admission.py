@@ -0,0 +1,156 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+class AdmissionRejected(Exception):
+    """Raised when a job is refused; maps to a 429/503 response with Retry-After"""
+
+    def __init__(self, message, status, retry_after):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+class TokenBucket:
+    """Allow ``burst`` jobs at once, refilled at ``rate`` jobs per second"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self, cost=1.0):
+        """Consume ``cost`` tokens; returns 0 on success, else seconds until they are available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0
+        return (cost - self.tokens) / self.rate
+
+    def is_full(self):
+        return self.tokens + (time.monotonic() - self.updated) * self.rate >= self.burst
+
+
+class AdmissionController:
+    """Bounded admission for analysis jobs.
+
+    - Per-user token buckets cap how many jobs each user may start (429).
+    - Each media type has its own concurrency limit, so a burst of videos
+      cannot take the slots needed for images or audio.
+    - Jobs over the limit wait in a bounded queue shared by all media types;
+      when it is full, or a job waits longer than ``queue_timeout``, the job
+      is refused with 503.
+
+    Keeping running plus queued jobs below the server's thread count leaves
+    threads free for cheap routes such as /health and /login. Callers must
+    therefore be admitted before they read a request body: an upload that
+    is being received holds a thread just like one being analyzed.
+    """
+
+    def __init__(self, concurrency, max_queue, queue_timeout, user_rate, user_burst):
+        self.concurrency = dict(concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self._lock = threading.Lock()
+        self._slots = {kind: threading.Semaphore(limit) for kind, limit in self.concurrency.items()}
+        self._active = dict.fromkeys(self.concurrency, 0)
+        self._waiting = 0
+        self._buckets = {}
+        # Moving average of job duration per media type, used for Retry-After
+        self._service_seconds = dict.fromkeys(self.concurrency, 5.0)
+        self._stats = {
+            'admitted': 0,
+            'rejected_quota': 0,
+            'rejected_queue_full': 0,
+            'rejected_timeout': 0
+        }
+
+    def _retry_after(self, media_type):
+        backlog = (self._waiting + 1) / max(1, self.concurrency[media_type])
+        return backlog * self._service_seconds[media_type]
+
+    def _check_quota(self, user_id, cost):
+        if not cost:
+            return
+        with self._lock:
+            bucket = self._buckets.get(user_id)
+            if bucket is None:
+                if len(self._buckets) > 10000:
+                    # Full buckets carry no state worth keeping
+                    self._buckets = {u: b for u, b in self._buckets.items() if not b.is_full()}
+                bucket = self._buckets[user_id] = TokenBucket(self.user_rate, self.user_burst)
+            wait = bucket.take(cost)
+            if wait:
+                self._stats['rejected_quota'] += 1
+                raise AdmissionRejected('Upload quota exceeded, please slow down', 429, wait)
+
+    def _acquire(self, media_type):
+        slots = self._slots[media_type]
+        if slots.acquire(blocking=False):
+            return
+
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                self._stats['rejected_queue_full'] += 1
+                raise AdmissionRejected('Server is busy, please retry later', 503, self._retry_after(media_type))
+            self._waiting += 1
+
+        try:
+            acquired = slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        if not acquired:
+            with self._lock:
+                self._stats['rejected_timeout'] += 1
+                retry_after = self._retry_after(media_type)
+            raise AdmissionRejected('Server is busy, please retry later', 503, retry_after)
+
+    def check_quota(self, user_id, cost=1.0):
+        """Charge ``cost`` jobs to the user's quota without taking a slot, or raise AdmissionRejected"""
+        self._check_quota(user_id, cost)
+
+    @contextmanager
+    def admit(self, media_type, user_id, cost=1.0):
+        """Hold a slot for one ``media_type`` job, or raise AdmissionRejected.
+
+        ``cost`` is charged to the user's quota first; pass 0 when the job
+        was already charged, e.g. at /upload/init for a chunked upload.
+        """
+        if media_type not in self._slots:
+            raise ValueError(f"Unknown admission class: {media_type}")
+        self._check_quota(user_id, cost)
+        self._acquire(media_type)
+
+        started = time.monotonic()
+        with self._lock:
+            self._active[media_type] += 1
+            self._stats['admitted'] += 1
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._active[media_type] -= 1
+                self._service_seconds[media_type] = 0.8 * self._service_seconds[media_type] + 0.2 * elapsed
+            self._slots[media_type].release()
+
+    def stats(self):
+        """Running and queued jobs and rejection counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['waiting'] = self._waiting
+            stats['max_queue'] = self.max_queue
+            for media_type, limit in self.concurrency.items():
+                stats[f'{media_type}_active'] = self._active[media_type]
+                stats[f'{media_type}_limit'] = limit
+        return stats
@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+
+class ChunkedUploadError(Exception):
+    """Raised when a chunked upload request cannot be honoured"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class ChunkedUploadManager:
+    """Resumable uploads written chunk by chunk into a preallocated file.
+
+    Each session lives in ``<root>/<upload_id>/``:
+
+    - ``meta.json``   upload parameters (filename, size, chunk size, owner)
+    - ``data.part``   file preallocated to the final size; chunks are written
+                      at ``index * chunk_size`` so they may arrive in any order
+    - ``chunks/<n>``  marker holding the SHA-256 of chunk ``n``; it is written
+                      only after the chunk data is flushed, so the set of
+                      markers is the set of chunks that survived a disconnect
+
+    The whole-file SHA-256 is computed incrementally: the hasher advances over
+    the contiguous prefix of received chunks as they land, so completing an
+    upload only hashes whatever has not been folded in yet.
+
+    ``meta.json`` is touched whenever a chunk is accepted, so its mtime is
+    the session's last activity. A session expires ``session_ttl`` seconds
+    after that, and an upload that is still progressing never expires. A
+    user may hold at most ``max_sessions_per_user`` open sessions, because
+    each one preallocates its full size on disk.
+    """
+
+    def __init__(self, root, chunk_size, max_size, session_ttl, max_sessions_per_user=3):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.session_ttl = session_ttl
+        self.max_sessions_per_user = max_sessions_per_user
+        self._lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._hashers = {}
+
+    # Session helpers
+    def _session_dir(self, upload_id):
+        # upload_id comes from the URL, only accept ids we could have issued
+        try:
+            uuid.UUID(hex=upload_id)
+        except (ValueError, TypeError):
+            raise ChunkedUploadError('Unknown upload', 404)
+        return os.path.join(self.root, upload_id)
+
+    def _load_meta(self, upload_id, user_id):
+        meta_path = os.path.join(self._session_dir(upload_id), 'meta.json')
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            raise ChunkedUploadError('Unknown upload', 404)
+
+        if meta.get('user_id') != user_id:
+            raise ChunkedUploadError('Unknown upload', 404)
+        return meta
+
+    def _chunk_length(self, meta, index):
+        start = index * meta['chunk_size']
+        return min(meta['chunk_size'], meta['size'] - start)
+
+    def _touch(self, upload_id):
+        """Record activity on a session so cleanup_expired keeps it"""
+        try:
+            os.utime(os.path.join(self._session_dir(upload_id), 'meta.json'))
+        except OSError:
+            pass
+
+    def _open_sessions(self, user_id):
+        """Number of sessions the user currently holds"""
+        count = 0
+        for upload_id in os.listdir(self.root) if os.path.isdir(self.root) else []:
+            try:
+                with open(os.path.join(self.root, upload_id, 'meta.json'), 'r') as f:
+                    count += json.load(f).get('user_id') == user_id
+            except (OSError, ValueError):
+                continue
+        return count
+
+    def _received(self, upload_id):
+        chunks_dir = os.path.join(self._session_dir(upload_id), 'chunks')
+        try:
+            return sorted(int(name) for name in os.listdir(chunks_dir) if name.isdigit())
+        except OSError:
+            return []
+
+    def _status(self, meta):
+        return {
+            'upload_id': meta['upload_id'],
+            'filename': meta['filename'],
+            'size': meta['size'],
+            'chunk_size': meta['chunk_size'],
+            'total_chunks': meta['total_chunks'],
+            'received': self._received(meta['upload_id'])
+        }
+
+    def _hasher(self, upload_id):
+        with self._lock:
+            if upload_id not in self._hashers:
+                self._hashers[upload_id] = {
+                    'sha256': hashlib.sha256(),
+                    'next_index': 0,
+                    'lock': threading.Lock()
+                }
+            return self._hashers[upload_id]
+
+    def _advance_hash(self, meta, index=None, data=None):
+        """Fold every contiguous received chunk into the running file hash"""
+        upload_id = meta['upload_id']
+        session_dir = self._session_dir(upload_id)
+        state = self._hasher(upload_id)
+
+        with state['lock']:
+            received = set(self._received(upload_id))
+            data_path = os.path.join(session_dir, 'data.part')
+            with open(data_path, 'rb') as f:
+                while state['next_index'] in received:
+                    current = state['next_index']
+                    if current == index and data is not None:
+                        # The chunk that just landed is still in memory
+                        state['sha256'].update(data)
+                    else:
+                        f.seek(current * meta['chunk_size'])
+                        state['sha256'].update(f.read(self._chunk_length(meta, current)))
+                    state['next_index'] += 1
+            return state['next_index']
+
+    # Public API
+    def init_upload(self, filename, size, user_id, chunk_size=None):
+        """Create a session and preallocate its data file"""
+        # bool is an int subclass; JSON true must not pass as a 1-byte upload
+        if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+            raise ChunkedUploadError('Upload size must be a positive integer')
+        if size > self.max_size:
+            raise ChunkedUploadError('File too large', 413)
+
+        chunk_size = chunk_size or self.chunk_size
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) \
+                or chunk_size <= 0 or chunk_size > self.chunk_size:
+            raise ChunkedUploadError(f'Chunk size must be between 1 and {self.chunk_size} bytes')
+
+        self.cleanup_expired()
+
+        upload_id = uuid.uuid4().hex
+        session_dir = os.path.join(self.root, upload_id)
+        meta = {
+            'upload_id': upload_id,
+            'filename': filename,
+            'size': size,
+            'chunk_size': chunk_size,
+            'total_chunks': (size + chunk_size - 1) // chunk_size,
+            'user_id': user_id,
+            'created': time.time()
+        }
+
+        # The session is assembled in a staging directory and renamed into
+        # place, so other requests never see it without its data file or
+        # full metadata. Counting and creating under one lock keeps
+        # concurrent inits in this process within the limit.
+        with self._init_lock:
+            if self._open_sessions(user_id) >= self.max_sessions_per_user:
+                raise ChunkedUploadError(
+                    f'Too many unfinished uploads (limit {self.max_sessions_per_user}), '
+                    'complete or wait for one to expire', 429)
+            staging_dir = os.path.join(self.root, f'.{upload_id}.tmp')
+            os.makedirs(os.path.join(staging_dir, 'chunks'))
+            try:
+                with open(os.path.join(staging_dir, 'data.part'), 'wb') as f:
+                    if hasattr(os, 'posix_fallocate'):
+                        os.posix_fallocate(f.fileno(), 0, size)
+                    else:
+                        f.truncate(size)
+                with open(os.path.join(staging_dir, 'meta.json'), 'w') as f:
+                    json.dump(meta, f)
+                os.rename(staging_dir, session_dir)
+            except OSError:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                raise
+
+        print(f"Chunked upload started: {upload_id} ({filename}, {size} bytes, {meta['total_chunks']} chunks)")
+        return self._status(meta)
+
+    def get_status(self, upload_id, user_id):
+        """Return session parameters and the chunk indices already stored"""
+        return self._status(self._load_meta(upload_id, user_id))
+
+    def write_chunk(self, upload_id, index, data, checksum, user_id):
+        """Verify a chunk against its checksum and write it at its offset"""
+        meta = self._load_meta(upload_id, user_id)
+
+        if index < 0 or index >= meta['total_chunks']:
+            raise ChunkedUploadError('Chunk index out of range')
+        if len(data) != self._chunk_length(meta, index):
+            raise ChunkedUploadError(f'Chunk {index} must be {self._chunk_length(meta, index)} bytes')
+        if not checksum:
+            raise ChunkedUploadError('Missing chunk checksum')
+
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != checksum.lower():
+            raise ChunkedUploadError(f'Checksum mismatch for chunk {index}', 422)
+
+        session_dir = self._session_dir(upload_id)
+        marker_path = os.path.join(session_dir, 'chunks', str(index))
+
+        if os.path.exists(marker_path):
+            with open(marker_path, 'r') as f:
+                if f.read().strip() != digest:
+                    raise ChunkedUploadError(f'Chunk {index} was already uploaded with different content', 409)
+            # Retried chunk that already landed
+            self._touch(upload_id)
+            return self._status(meta)
+
+        with open(os.path.join(session_dir, 'data.part'), 'r+b') as f:
+            f.seek(index * meta['chunk_size'])
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with open(marker_path, 'w') as f:
+            f.write(digest)
+        self._touch(upload_id)
+
+        self._advance_hash(meta, index, data)
+        return self._status(meta)
+
+    def complete(self, upload_id, user_id, expected_sha256=None):
+        """Finish the upload and return (data_path, filename, sha256)"""
+        meta = self._load_meta(upload_id, user_id)
+
+        if self._advance_hash(meta) < meta['total_chunks']:
+            missing = sorted(set(range(meta['total_chunks'])) - set(self._received(upload_id)))
+            raise ChunkedUploadError(f'Upload incomplete, missing chunks: {missing[:20]}', 409)
+
+        with self._lock:
+            state = self._hashers.pop(upload_id)
+        file_hash = state['sha256'].hexdigest()
+
+        if expected_sha256 and expected_sha256.lower() != file_hash:
+            raise ChunkedUploadError('File checksum mismatch', 422)
+
+        data_path = os.path.join(self._session_dir(upload_id), 'data.part')
+        print(f"Chunked upload complete: {upload_id} sha256={file_hash}")
+        return data_path, meta['filename'], file_hash
+
+    def discard(self, upload_id):
+        """Remove a session and everything it stored"""
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+
+    def cleanup_expired(self):
+        """Remove sessions with no accepted chunk within the configured TTL"""
+        if not os.path.isdir(self.root):
+            return
+        cutoff = time.time() - self.session_ttl
+        for upload_id in os.listdir(self.root):
+            session_dir = os.path.join(self.root, upload_id)
+            try:
+                if upload_id.endswith('.tmp'):
+                    # Staging directory left behind by a crash during init
+                    if os.path.getmtime(session_dir) < cutoff:
+                        shutil.rmtree(session_dir, ignore_errors=True)
+                elif os.path.getmtime(os.path.join(session_dir, 'meta.json')) < cutoff:
+                    print(f"Removing expired chunked upload: {upload_id}")
+                    self.discard(upload_id)
+            except (OSError, ChunkedUploadError):
+                continue
+
+        # Sessions another worker expired or completed leave their hasher here
+        with self._lock:
+            for upload_id in list(self._hashers):
+                if not os.path.isdir(os.path.join(self.root, upload_id)):
+                    del self._hashers[upload_id]
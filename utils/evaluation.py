@@ -0,0 +1,289 @@
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: each process keeps its own state file writes
+    fcntl = None
+
+# Bytes of the feedback log parsed per pass, to bound memory on a large backlog
+READ_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def feedback_outcome(record):
+    """(predicted fake, actually fake, fake probability) of one feedback record, or None.
+
+    The actual label is ``userFeedback.actualResult`` when given, otherwise
+    the prediction itself or its inverse depending on ``isCorrect``.
+    ``aiConfidence`` is the fake score the client displayed; percentages are
+    scaled to [0, 1].
+    """
+    predicted = record.get('aiPrediction')
+    feedback = record.get('userFeedback') or {}
+    if predicted is None or feedback.get('isCorrect') is None:
+        return None
+
+    actual = feedback.get('actualResult')
+    if actual is None:
+        actual = predicted if feedback['isCorrect'] else not predicted
+
+    confidence = float(record.get('aiConfidence') or 0)
+    if confidence > 1:
+        confidence /= 100.0
+    return bool(predicted), bool(actual), min(max(confidence, 0.0), 1.0)
+
+
+class FeedbackMetrics:
+    """Running accuracy and calibration metrics over the append-only feedback log.
+
+    Each ``update()`` parses only the lines appended since the last one,
+    tracked as a byte offset, and adds them to per (media type, model
+    version) counters:
+
+    - ``confusion[g, actual, predicted]`` with fake = 1
+    - ``bin_count``, ``bin_confidence`` and ``bin_fake`` over ``bins``
+      equal-width bins of the predicted fake probability
+
+    Offset and counters are saved to ``state_path`` so a restart resumes
+    without rescanning the log. A log smaller than the saved offset was
+    rotated or truncated and is re-read from the start.
+
+    Every worker process updates the same state file. Each update holds an
+    flock on ``<state_path>.lock`` and first reloads the file if another
+    worker has saved it since, so no lines are counted twice and no
+    worker's progress is lost.
+    """
+
+    def __init__(self, log_path, state_path=None, bins=10):
+        self.log_path = log_path
+        self.state_path = state_path
+        self.bins = bins
+        self._lock = threading.Lock()
+        self._state_signature = None
+        self._reset()
+        if state_path:
+            self._reload_state()
+
+    def _reset(self):
+        self.offset = 0
+        self.groups = []
+        self.confusion = np.zeros((0, 2, 2), dtype=np.int64)
+        self.bin_count = np.zeros((0, self.bins), dtype=np.int64)
+        self.bin_confidence = np.zeros((0, self.bins), dtype=np.float64)
+        self.bin_fake = np.zeros((0, self.bins), dtype=np.int64)
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            if state['bins'] != self.bins:
+                return
+            self.offset = state['offset']
+            self.groups = [tuple(group) for group in state['groups']]
+            self.confusion = np.array(state['confusion'], dtype=np.int64).reshape(-1, 2, 2)
+            self.bin_count = np.array(state['bin_count'], dtype=np.int64).reshape(-1, self.bins)
+            self.bin_confidence = np.array(state['bin_confidence'], dtype=np.float64).reshape(-1, self.bins)
+            self.bin_fake = np.array(state['bin_fake'], dtype=np.int64).reshape(-1, self.bins)
+        except Exception as e:
+            print(f"Ignoring unreadable feedback metrics state: {e}")
+            self._reset()
+
+    def _reload_state(self):
+        """Load the saved state if it changed since this process last loaded or saved it"""
+        try:
+            stat = os.stat(self.state_path)
+        except OSError:
+            return
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if signature != self._state_signature:
+            self._reset()
+            self._load_state()
+            self._state_signature = signature
+
+    @contextmanager
+    def _state_lock(self):
+        """Serialize updates across worker processes"""
+        if not self.state_path or fcntl is None:
+            yield
+            return
+        with open(f'{self.state_path}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save_state(self):
+        state = {
+            'offset': self.offset,
+            'bins': self.bins,
+            'groups': self.groups,
+            'confusion': self.confusion.tolist(),
+            'bin_count': self.bin_count.tolist(),
+            'bin_confidence': self.bin_confidence.tolist(),
+            'bin_fake': self.bin_fake.tolist()
+        }
+        tmp_path = f'{self.state_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+        stat = os.stat(self.state_path)
+        self._state_signature = (stat.st_size, stat.st_mtime_ns)
+
+    def _group_ids(self, keys):
+        index = {group: i for i, group in enumerate(self.groups)}
+        new = [key for key in dict.fromkeys(keys) if key not in index]
+        if new:
+            for key in new:
+                index[key] = len(self.groups)
+                self.groups.append(key)
+            grow = len(new)
+            self.confusion = np.concatenate([self.confusion, np.zeros((grow, 2, 2), np.int64)])
+            self.bin_count = np.concatenate([self.bin_count, np.zeros((grow, self.bins), np.int64)])
+            self.bin_confidence = np.concatenate([self.bin_confidence, np.zeros((grow, self.bins))])
+            self.bin_fake = np.concatenate([self.bin_fake, np.zeros((grow, self.bins), np.int64)])
+        return np.array([index[key] for key in keys], dtype=np.int64)
+
+    def _add(self, lines):
+        keys, predicted, actual, confidence = [], [], [], []
+        for line in lines:
+            try:
+                record = json.loads(line)
+                outcome = feedback_outcome(record)
+            except (ValueError, TypeError, AttributeError):
+                continue
+            if outcome is None:
+                continue
+            keys.append((str(record.get('type') or 'unknown'), str(record.get('modelVersion') or 'unknown')))
+            predicted.append(outcome[0])
+            actual.append(outcome[1])
+            confidence.append(outcome[2])
+        if not keys:
+            return 0
+
+        group = self._group_ids(keys)
+        predicted = np.array(predicted, dtype=np.int64)
+        actual = np.array(actual, dtype=np.int64)
+        confidence = np.array(confidence, dtype=np.float64)
+        bins = np.minimum((confidence * self.bins).astype(np.int64), self.bins - 1)
+
+        np.add.at(self.confusion, (group, actual, predicted), 1)
+        np.add.at(self.bin_count, (group, bins), 1)
+        np.add.at(self.bin_confidence, (group, bins), confidence)
+        np.add.at(self.bin_fake, (group, bins), actual)
+        return len(keys)
+
+    def update(self):
+        """Fold lines appended since the last call into the counters; returns how many were added"""
+        with self._lock, self._state_lock():
+            if self.state_path:
+                self._reload_state()
+            try:
+                size = os.path.getsize(self.log_path)
+            except OSError:
+                return 0
+            if size < self.offset:
+                print("Feedback log shrank, recomputing metrics from the start")
+                self._reset()
+            if size == self.offset:
+                return 0
+
+            added = 0
+            pending = b''
+            skipped = 0  # Bytes of an oversized line being skipped
+            with open(self.log_path, 'rb') as f:
+                f.seek(self.offset)
+                while True:
+                    data = f.read(READ_CHUNK_SIZE)
+                    if not data:
+                        # A trailing line without its newline is still being written
+                        break
+                    data = pending + data
+                    end = data.rfind(b'\n') + 1
+                    if not end:
+                        if len(data) > READ_CHUNK_SIZE:
+                            # No feedback record is this long; drop it up to its newline
+                            skipped += len(data)
+                            pending = b''
+                        else:
+                            pending = data
+                        continue
+                    lines = data[:end].splitlines()
+                    if skipped:
+                        print(f"Skipping oversized feedback log line at offset {self.offset}")
+                        lines = lines[1:]
+                    added += self._add(lines)
+                    self.offset += skipped + end
+                    skipped = 0
+                    pending = data[end:]
+            if self.state_path:
+                self._save_state()
+            return added
+
+    def summary(self, media_type=None, model_version=None):
+        """Metrics per (media type, model version), optionally filtered"""
+        with self._lock:
+            results = []
+            for g, (group_type, group_version) in enumerate(self.groups):
+                if media_type and group_type != media_type:
+                    continue
+                if model_version and group_version != model_version:
+                    continue
+                results.append(self._group_summary(g, group_type, group_version))
+            return {'records': sum(r['records'] for r in results), 'log_offset': self.offset, 'groups': results}
+
+    def _group_summary(self, g, media_type, model_version):
+        (tn, fp), (fn, tp) = self.confusion[g].tolist()
+        total = tn + fp + fn + tp
+        precision = tp / (tp + fp) if tp + fp else None
+        recall = tp / (tp + fn) if tp + fn else None
+        if precision is None or recall is None:
+            f1 = None
+        else:
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+        count = self.bin_count[g]
+        filled = count > 0
+        mean_confidence = np.divide(self.bin_confidence[g], count, out=np.zeros(self.bins), where=filled)
+        fake_rate = np.divide(self.bin_fake[g], count, out=np.zeros(self.bins), where=filled)
+        # Expected calibration error: bin-weighted gap between confidence and observed fake rate
+        ece = float((count * np.abs(mean_confidence - fake_rate)).sum() / total) if total else None
+
+        edges = np.linspace(0, 1, self.bins + 1)
+        return {
+            'media_type': media_type,
+            'model_version': model_version,
+            'records': total,
+            'confusion_matrix': {'tp': tp, 'fp': fp, 'tn': tn, 'fn': fn},
+            'accuracy': (tp + tn) / total if total else None,
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'expected_calibration_error': ece,
+            'calibration': [
+                {
+                    'range': [round(float(edges[b]), 4), round(float(edges[b + 1]), 4)],
+                    'count': int(count[b]),
+                    'mean_confidence': float(mean_confidence[b]) if filled[b] else None,
+                    'observed_fake_rate': float(fake_rate[b]) if filled[b] else None
+                }
+                for b in range(self.bins)
+            ]
+        }
+
+    def stats(self):
+        """Flat accuracy, precision and recall per group for the metrics registry"""
+        self.update()
+        values = {}
+        for group in self.summary()['groups']:
+            prefix = re.sub(r'\W+', '_', f"{group['media_type']}_{group['model_version']}")
+            values[f'{prefix}_records'] = group['records']
+            for key in ('accuracy', 'precision', 'recall', 'expected_calibration_error'):
+                if group[key] is not None:
+                    values[f'{prefix}_{key}'] = group[key]
+        return values
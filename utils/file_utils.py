@@ -1,4 +1,4 @@
-from typing import Set
+from typing import Optional, Set
 from config import Config
 
 def allowed_file(filename: str) -> bool:
@@ -6,3 +6,18 @@ def allowed_file(filename: str) -> bool:
         return False
     extension = filename.rsplit(".", 1)[1].lower()
     return extension in Config.ALLOWED_EXTENSIONS
+
+MEDIA_EXTENSIONS = {
+    'image': {'png', 'jpg', 'jpeg'},
+    'video': {'mp4', 'avi', 'mov', 'webm'},
+    'audio': {'mp3', 'wav', 'ogg'}
+}
+
+def get_media_type(filename: str) -> Optional[str]:
+    if not filename or "." not in filename:
+        return None
+    extension = filename.rsplit(".", 1)[1].lower()
+    for media_type, extensions in MEDIA_EXTENSIONS.items():
+        if extension in extensions:
+            return media_type
+    return None
@@ -0,0 +1,99 @@
+import numpy as np
+from PIL import Image, ImageOps
+
+# Size reductions the decoders can apply while decoding
+REDUCTION_FACTORS = (8, 4, 2)
+
+# A reduced decode may land this far below max_side. The decoders only
+# halve, so an exact floor would keep anything under 2 * max_side at full
+# size (a 12 MP photo would stay 4000x3000 for max_side=2048).
+REDUCTION_TOLERANCE = 0.75
+
+
+class ImageTooLarge(ValueError):
+    """Raised for images whose pixel count exceeds the decode limit (decompression bombs)"""
+
+
+def read_image_info(filepath):
+    """Format and dimensions from the image header, without decoding pixels"""
+    try:
+        with Image.open(filepath) as image:
+            return {
+                'format': image.format,
+                'width': image.width,
+                'height': image.height
+            }
+    except Image.DecompressionBombError as e:
+        raise ImageTooLarge(str(e))
+
+
+def reduction_factor(width, height, max_side, tolerance=REDUCTION_TOLERANCE):
+    """Largest decoder reduction that keeps the longest side at or above tolerance * max_side"""
+    longest = max(width, height)
+    for factor in REDUCTION_FACTORS:
+        if longest // factor >= max_side * tolerance:
+            return factor
+    return 1
+
+
+def load_image(filepath, max_side=2048, max_pixels=100_000_000):
+    """Decode an image as a BGR array, at reduced resolution when it is large.
+
+    The header is read first: images above ``max_pixels`` are rejected before
+    any pixel buffer is allocated. JPEGs are then decoded with PIL's draft
+    mode, which scales by 1/2, 1/4 or 1/8 inside the DCT so the full-size
+    bitmap never exists. Other formats go through OpenCV's IMREAD_REDUCED_*
+    flags, which still decode at full size but return the smaller image.
+    EXIF orientation is applied in both cases.
+
+    Returns ``(image, info)``; ``info`` holds the original and decoded sizes.
+    """
+    info = read_image_info(filepath)
+    width, height = info['width'], info['height']
+    if width * height > max_pixels:
+        raise ImageTooLarge(f"Image is {width}x{height}, above the {max_pixels} pixel limit")
+
+    factor = reduction_factor(width, height, max_side)
+
+    if info['format'] == 'JPEG':
+        with Image.open(filepath) as image:
+            image.draft('RGB', (width // factor, height // factor))
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            # RGB -> BGR to match what cv2.imread returns
+            decoded = np.ascontiguousarray(np.asarray(image)[:, :, ::-1])
+    else:
+        import cv2
+
+        flags = {
+            1: cv2.IMREAD_COLOR,
+            2: cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_COLOR_4,
+            8: cv2.IMREAD_REDUCED_COLOR_8
+        }
+        decoded = cv2.imread(filepath, flags[factor])
+        if decoded is None:
+            raise ValueError(f"Could not decode image {filepath}")
+
+    info['decoded_width'] = decoded.shape[1]
+    info['decoded_height'] = decoded.shape[0]
+    info['reduction_factor'] = factor
+    return decoded, info
+
+
+def load_face_cascade():
+    """OpenCV's frontal face Haar cascade"""
+    import cv2
+
+    return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+
+def crop_faces(frame, face_cascade, size=(256, 256)):
+    """Detect faces in a BGR frame and return them as uint8 crops resized to ``size``.
+
+    Shared by inference and training data prep so both see identical crops.
+    """
+    import cv2
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+    return [cv2.resize(frame[y:y+h, x:x+w], size) for (x, y, w, h) in faces]
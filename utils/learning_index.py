@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+STATUS_LEARNED = 'learned'
+STATUS_PENDING = 'pending'
+
+
+def _summarize(key, data):
+    """The fields the admin page shows for one entry, without the bulky original results"""
+    record = {
+        'key': key,
+        'filename': data.get('filename'),
+        'media_type': data.get('media_type'),
+        'file_hash': data.get('file_hash'),
+        'analysis_id': data.get('analysis_id'),
+        'timestamp': data.get('timestamp') or 0,
+        'lookup': key.startswith('analysis_'),
+        'hash_key': data.get('hash_key')
+    }
+    learned = data.get('learned_result')
+    if learned:
+        record['learned_result'] = {
+            'is_fake': learned.get('is_fake'),
+            'confidence': learned.get('confidence', 0),
+            'feedback_timestamp': learned.get('feedback_timestamp', 0)
+        }
+    return record
+
+
+class LearningIndex:
+    """Filterable, newest-first index over the learning database.
+
+    The database is one JSON file rewritten on every change. Writers in
+    this process hand the entries they changed to ``apply``, so the index
+    follows them without re-reading the file; only a change made by another
+    process (the file's size or mtime moved on without us) triggers a full
+    reload. The index keeps a light record per entry plus NumPy columns
+    (timestamp, media type, learned) that queries filter on, so serving a
+    page never touches the full results.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._entries = {}
+        self._dirty = False
+        self.records = []
+        self.timestamps = np.zeros(0)
+        self.media_types = np.zeros(0, dtype=object)
+        self.learned = np.zeros(0, dtype=bool)
+
+    def signature(self):
+        """(size, mtime) of the database file, or None when it does not exist"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def refresh(self):
+        """Bring the index up to date with the database file; returns False when there is no database.
+
+        A file caught half-written by its writer keeps the last good index
+        in place (it is reloaded on the next call); only when there is none
+        yet does the JSON error propagate.
+        """
+        signature = self.signature()
+        if signature is None:
+            return False
+
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    with open(self.path) as f:
+                        learning_db = json.load(f)
+                except (OSError, ValueError) as e:
+                    if self._signature is None:
+                        raise
+                    print(f"Learning database unreadable, serving the previous index: {e}")
+                    return True
+                self._entries = {key: _summarize(key, data) for key, data in learning_db.items()}
+                self._signature = signature
+                self._dirty = True
+            if self._dirty:
+                self._rebuild()
+        return True
+
+    def apply(self, entries, previous_signature):
+        """Fold entries a writer just saved into the index.
+
+        ``previous_signature`` is the file's signature before the write; if
+        the index was not built from that version, it is already behind and
+        the next ``refresh`` reloads the file instead.
+        """
+        with self._lock:
+            if self._signature is None or self._signature != previous_signature:
+                return
+            for key, data in entries.items():
+                self._entries[key] = _summarize(key, data)
+            self._signature = self.signature()
+            self._dirty = True
+
+    def _rebuild(self):
+        records = list(self._entries.values())
+        # Lookup entries take the status of the file entry they point to
+        learned_keys = {r['key'] for r in records if 'learned_result' in r}
+        learned = np.array([
+            r['key'] in learned_keys or (r['lookup'] and r['hash_key'] in learned_keys)
+            for r in records
+        ], dtype=bool)
+
+        timestamps = np.array([float(r['timestamp']) for r in records])
+        order = np.argsort(-timestamps, kind='stable')
+        self.records = [records[i] for i in order]
+        self.timestamps = timestamps[order]
+        self.media_types = np.array([r['media_type'] or '' for r in self.records], dtype=object)
+        self.learned = learned[order]
+        self._dirty = False
+
+    def query(self, media_type=None, status=None, since=None, until=None, offset=0, limit=50):
+        """Matching records, newest first, as ``(total matches, page of records, learned flags)``"""
+        with self._lock:
+            mask = np.ones(len(self.records), dtype=bool)
+            if media_type:
+                mask &= self.media_types == media_type
+            if status == STATUS_LEARNED:
+                mask &= self.learned
+            elif status == STATUS_PENDING:
+                mask &= ~self.learned
+            if since is not None:
+                mask &= self.timestamps >= since
+            if until is not None:
+                mask &= self.timestamps < until
+
+            matches = np.flatnonzero(mask)
+            page = matches[offset:offset + limit]
+            return len(matches), [self.records[i] for i in page], self.learned[page].tolist()
+
+    def counts(self):
+        """Entries per status, for the page header"""
+        with self._lock:
+            learned = int(self.learned.sum())
+            return {'total': len(self.records), STATUS_LEARNED: learned, STATUS_PENDING: len(self.records) - learned}
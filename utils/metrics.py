@@ -0,0 +1,38 @@
+import threading
+
+_lock = threading.Lock()
+_sources = {}
+
+
+def register(name, collect):
+    """Register a metrics source.
+
+    ``collect`` is called on every scrape and returns a flat dict of
+    numeric values; each is exported as ``falsifyx_<name>_<key>``.
+    """
+    with _lock:
+        _sources[name] = collect
+
+
+def snapshot():
+    """Current values of every registered source, keyed by source name"""
+    with _lock:
+        sources = dict(_sources)
+
+    values = {}
+    for name, collect in sources.items():
+        try:
+            values[name] = collect()
+        except Exception as e:
+            print(f"Error collecting metrics from {name}: {e}")
+    return values
+
+
+def render_prometheus():
+    """All registered metrics in the Prometheus text exposition format"""
+    lines = []
+    for name, values in sorted(snapshot().items()):
+        for key, value in sorted(values.items()):
+            if isinstance(value, (int, float)):
+                lines.append(f"falsifyx_{name}_{key} {float(value)}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,265 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+REASON_REQUESTED = 'requested'
+REASON_TOGGLE = 'toggle'
+REASON_SAMPLED = 'sampled'
+
+# Longest the admin toggle may profile every job for
+MAX_TOGGLE_MINUTES = 24 * 60
+
+
+class RequestProfiler:
+    """Opt-in cProfile capture of analysis jobs, stored on disk.
+
+    A job is profiled when the caller asks for it (an admin's X-Profile
+    header), while the admin toggle is on, or at random with probability
+    ``sample_rate``. Requested and toggled profiles are kept up to
+    ``keep_requested``, newest first; of the sampled ones only the
+    ``keep_slowest`` slowest are kept, so under production traffic the
+    directory converges on the worst requests.
+
+    Each profile is ``<id>.prof`` (for pstats or snakeviz) plus ``<id>.json``
+    with its metadata and a text summary. The toggle lives in
+    ``toggle.json`` so every worker process sees it.
+
+    Retention works from an in-memory index of profile metadata. It is
+    re-synced only when the directory's mtime changes, that is when some
+    worker added or removed a profile, and then only new files are read.
+
+    cProfile only records the thread that enables it. Work a job hands to
+    the video executors is therefore submitted through ``wrap``, which
+    profiles it on the executor thread; those profiles are merged into the
+    job's with ``pstats.Stats.add``. Only one job per process is profiled
+    at a time; others run unprofiled rather than wait.
+    """
+
+    def __init__(self, root, sample_rate=0.0, keep_slowest=20, keep_requested=50):
+        self.root = root
+        self.sample_rate = sample_rate
+        self.keep_slowest = keep_slowest
+        self.keep_requested = keep_requested
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+        self._local = threading.local()
+        self._toggle = {}
+        self._toggle_mtime = None
+        self._index = {}
+        self._index_mtime = None
+        self._stats = {'profiled': 0, 'saved': 0, 'skipped_busy': 0}
+
+    def _toggle_path(self):
+        return os.path.join(self.root, 'toggle.json')
+
+    def _read_toggle(self):
+        """Current toggle state, re-read only when the file changes"""
+        try:
+            mtime = os.stat(self._toggle_path()).st_mtime_ns
+        except OSError:
+            return {}
+        if mtime != self._toggle_mtime:
+            try:
+                with open(self._toggle_path()) as f:
+                    self._toggle = json.load(f)
+                self._toggle_mtime = mtime
+            except (OSError, ValueError):
+                return {}
+        return self._toggle
+
+    def set_toggle(self, enabled, minutes=10, sample_rate=None):
+        """Profile every job for ``minutes`` (or stop), and optionally change the sampling rate.
+
+        Raises ValueError for minutes outside (0, MAX_TOGGLE_MINUTES] or a
+        sample rate outside [0, 1].
+        """
+        try:
+            if isinstance(minutes, bool) or isinstance(sample_rate, bool):
+                raise TypeError
+            minutes = float(minutes)
+            sample_rate = None if sample_rate is None else float(sample_rate)
+        except (TypeError, ValueError):
+            raise ValueError('minutes and sample_rate must be numbers')
+        if not 0 < minutes <= MAX_TOGGLE_MINUTES:
+            raise ValueError(f'minutes must be between 0 and {MAX_TOGGLE_MINUTES}')
+        if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+            raise ValueError('sample_rate must be between 0 and 1')
+
+        os.makedirs(self.root, exist_ok=True)
+        state = {'enabled_until': time.time() + minutes * 60 if enabled else 0}
+        if sample_rate is not None:
+            state['sample_rate'] = sample_rate
+        tmp_path = f'{self._toggle_path()}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._toggle_path())
+        return self.status()
+
+    def status(self):
+        toggle = self._read_toggle()
+        enabled_until = toggle.get('enabled_until', 0)
+        return {
+            'enabled': enabled_until > time.time(),
+            'enabled_until': enabled_until or None,
+            'sample_rate': toggle.get('sample_rate', self.sample_rate),
+            'keep_slowest': self.keep_slowest,
+            'keep_requested': self.keep_requested
+        }
+
+    def _reason(self, requested):
+        if requested:
+            return REASON_REQUESTED
+        toggle = self._read_toggle()
+        if toggle.get('enabled_until', 0) > time.time():
+            return REASON_TOGGLE
+        if random.random() < toggle.get('sample_rate', self.sample_rate):
+            return REASON_SAMPLED
+        return None
+
+    @contextmanager
+    def profile(self, name, metadata=None, requested=False):
+        """Run the block under cProfile if this job is selected for profiling"""
+        reason = self._reason(requested)
+        if reason is None:
+            yield
+            return
+        if not self._active.acquire(blocking=False):
+            with self._lock:
+                self._stats['skipped_busy'] += 1
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        threads = self._local.threads = []
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        finally:
+            self._local.threads = None
+            self._active.release()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                threads = list(threads)
+            try:
+                self._save(profiler, threads, name, reason, elapsed, metadata or {})
+            except Exception as e:
+                print(f"Error saving profile: {e}")
+
+    def wrap(self, fn):
+        """``fn`` for submission to another thread, profiled into the current job when there is one"""
+        threads = getattr(self._local, 'threads', None)
+        if threads is None:
+            return fn
+
+        def run(*args, **kwargs):
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+                with self._lock:
+                    threads.append(profiler)
+
+        return run
+
+    def _sync(self):
+        """Bring the metadata index up to date with profiles saved or removed by other workers"""
+        try:
+            mtime = os.stat(self.root).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._index_mtime:
+            return
+        ids = {name[:-5] for name in os.listdir(self.root)
+               if name.endswith('.json') and name != 'toggle.json'}
+        for profile_id in set(self._index) - ids:
+            del self._index[profile_id]
+        for profile_id in ids - set(self._index):
+            try:
+                with open(os.path.join(self.root, f'{profile_id}.json')) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            meta.pop('summary', None)
+            self._index[profile_id] = meta
+        self._index_mtime = mtime
+
+    def _list(self, reason=None):
+        self._sync()
+        return [meta for meta in self._index.values() if reason is None or meta['reason'] == reason]
+
+    def _delete(self, profile_id):
+        self._index.pop(profile_id, None)
+        for ext in ('.prof', '.json'):
+            try:
+                os.remove(os.path.join(self.root, profile_id + ext))
+            except OSError:
+                pass
+
+    def _save(self, profiler, threads, name, reason, elapsed, metadata):
+        with self._lock:
+            self._stats['profiled'] += 1
+            os.makedirs(self.root, exist_ok=True)
+
+            # Sampled profiles compete for the slowest-N slots
+            if reason == REASON_SAMPLED:
+                kept = sorted(self._list(REASON_SAMPLED), key=lambda p: p['duration_ms'])
+                if len(kept) >= self.keep_slowest:
+                    if kept and kept[0]['duration_ms'] >= elapsed * 1000:
+                        return
+                    for old in kept[:len(kept) - self.keep_slowest + 1]:
+                        self._delete(old['id'])
+            else:
+                kept = sorted(self._list(), key=lambda p: p['timestamp'])
+                kept = [p for p in kept if p['reason'] != REASON_SAMPLED]
+                for old in kept[:max(len(kept) - self.keep_requested + 1, 0)]:
+                    self._delete(old['id'])
+
+            profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{uuid.uuid4().hex[:8]}"
+            summary = io.StringIO()
+            stats = pstats.Stats(profiler, stream=summary)
+            for thread_profiler in threads:
+                stats.add(thread_profiler)
+            stats.dump_stats(os.path.join(self.root, f'{profile_id}.prof'))
+
+            stats.sort_stats('cumulative').print_stats(40)
+            meta = dict(metadata, id=profile_id, name=name, reason=reason, pid=os.getpid(),
+                        timestamp=time.time(), duration_ms=round(elapsed * 1000, 1),
+                        threads=1 + len(threads), summary=summary.getvalue())
+            with open(os.path.join(self.root, f'{profile_id}.json'), 'w') as f:
+                json.dump(meta, f)
+            meta.pop('summary')
+            self._index[profile_id] = meta
+            self._stats['saved'] += 1
+            print(f"Saved {reason} profile {profile_id} ({meta['duration_ms']} ms)")
+
+    def list_profiles(self):
+        """Metadata of stored profiles, slowest first"""
+        with self._lock:
+            return sorted(self._list(), key=lambda p: -p['duration_ms'])
+
+    def get_profile(self, profile_id):
+        """(metadata with text summary, path of the .prof file), or None"""
+        if os.path.basename(profile_id) != profile_id:
+            return None
+        path = os.path.join(self.root, f'{profile_id}.json')
+        if profile_id == 'toggle' or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f), os.path.join(self.root, f'{profile_id}.prof')
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,107 @@
+import json
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for application/msgpack responses
+    msgpack = None
+
+COLUMNAR_JSON_MIMETYPE = 'application/vnd.falsifyx.columnar+json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+ROW_FORMAT = 'rows'
+COLUMNAR_FORMAT = 'columnar'
+MSGPACK_FORMAT = 'msgpack'
+
+
+def _section_keys(rows):
+    """Split row keys into scalar, nested-dict and list-of-dict keys, in first-seen order"""
+    scalars, sections, tables = {}, {}, {}
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, dict):
+                sections.setdefault(key, {}).update(dict.fromkeys(value))
+            elif isinstance(value, list):
+                tables[key] = None
+            else:
+                scalars[key] = None
+    # A key that is a dict in some rows and None in others is still a section
+    for key in list(scalars):
+        if key in sections or key in tables:
+            del scalars[key]
+    return list(scalars), {k: list(v) for k, v in sections.items()}, list(tables)
+
+
+def _columns(rows):
+    scalars, sections, _ = _section_keys(rows)
+    columns = {key: [row.get(key) for row in rows] for key in scalars}
+    for section, fields in sections.items():
+        for field in fields:
+            columns[f'{section}.{field}'] = [
+                (row.get(section) or {}).get(field) for row in rows
+            ]
+    return columns
+
+
+def to_columnar(rows):
+    """Convert a list of per-row dicts into per-field arrays.
+
+    Scalar fields become ``columns[key]``, nested dicts are flattened to
+    ``columns['section.field']`` (``None`` where a row has no such section),
+    and list-of-dict fields such as per-frame faces become child tables whose
+    ``row`` column holds the index of the parent row.
+    """
+    _, _, table_keys = _section_keys(rows)
+    tables = {}
+    for key in table_keys:
+        parents, children = [], []
+        for index, row in enumerate(rows):
+            for child in row.get(key) or []:
+                parents.append(index)
+                children.append(child)
+        table = {'row': parents}
+        table.update(_columns(children))
+        tables[key] = table
+
+    return {'length': len(rows), 'columns': _columns(rows), 'tables': tables}
+
+
+def video_results_to_columnar(results):
+    """Columnar form of ``process_video`` results (frames followed by summaries)"""
+    columnar = {'frames': to_columnar([r for r in results if 'frame' in r])}
+    for summary in results:
+        if 'frame' not in summary:
+            columnar.update(summary)
+    return columnar
+
+
+def negotiate_format(request):
+    """Pick the response format from ``?format=`` or the Accept header"""
+    requested = request.args.get('format', '').lower()
+    if requested in (ROW_FORMAT, COLUMNAR_FORMAT, MSGPACK_FORMAT):
+        return requested
+
+    best = request.accept_mimetypes.best_match(
+        ['application/json', COLUMNAR_JSON_MIMETYPE] + list(MSGPACK_MIMETYPES),
+        default='application/json'
+    )
+    if best == COLUMNAR_JSON_MIMETYPE:
+        return COLUMNAR_FORMAT
+    if best in MSGPACK_MIMETYPES:
+        return MSGPACK_FORMAT
+    return ROW_FORMAT
+
+
+def dumps_compact(payload):
+    """JSON without indentation or padding whitespace"""
+    return json.dumps(payload, separators=(',', ':'))
+
+
+def encode(payload, fmt):
+    """Serialize a payload, returning (body, mimetype)"""
+    if fmt == MSGPACK_FORMAT:
+        if msgpack is None:
+            raise RuntimeError('msgpack is not installed')
+        return msgpack.packb(payload, use_bin_type=True), MSGPACK_MIMETYPES[0]
+    if fmt == COLUMNAR_FORMAT:
+        return dumps_compact(payload), COLUMNAR_JSON_MIMETYPE
+    return dumps_compact(payload), 'application/json'
@@ -0,0 +1,260 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-use tracking stays per process
+    fcntl = None
+
+
+def hash_file(filepath, block_size=1024 * 1024):
+    """SHA-256 of a file, read in blocks"""
+    hash_sha256 = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            hash_sha256.update(block)
+    return hash_sha256.hexdigest()
+
+
+class ContentStore:
+    """Content-addressed storage for uploaded media.
+
+    Objects are stored once per content hash at ``<root>/<sha[:2]>/<sha>.<ext>``,
+    so identical uploads share a file and same-named uploads from different
+    users never overwrite each other. Every ``put`` takes a reference that the
+    caller drops with ``release`` once its analysis finishes.
+
+    While referenced, an object is held open with a shared ``flock``. Every
+    gunicorn worker runs its own janitor, and a janitor only removes an
+    object after taking an exclusive lock on it without blocking. So an
+    object another worker is still analyzing is never evicted.
+
+    The janitor evicts unreferenced objects older than ``max_age`` seconds and
+    then, least recently used first, until the store fits in ``max_bytes``.
+    An object's mtime is its last-use time and is refreshed on every ``put``.
+    """
+
+    def __init__(self, root, max_age, max_bytes):
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._refs = {}
+        self._janitor = None
+        self._stop = threading.Event()
+        self._stats = {
+            'objects': 0,
+            'bytes': 0,
+            'puts': 0,
+            'dedup_hits': 0,
+            'evictions_age': 0,
+            'evictions_quota': 0,
+            'janitor_runs': 0,
+            'last_janitor_run': 0.0
+        }
+        # Usage of what is already on disk, so stats are right before the first janitor pass
+        entries = self._scan()
+        self._stats['objects'] = len(entries)
+        self._stats['bytes'] = sum(size for _, size, _ in entries)
+
+    def path_for(self, file_hash, extension):
+        """Location of the object for a content hash"""
+        return os.path.join(self.root, file_hash[:2], f"{file_hash}.{extension.lower()}")
+
+    def put(self, src_path, extension, file_hash=None):
+        """Move a file into the store and take a reference on it.
+
+        Returns ``(object_path, file_hash)``. When the content is already
+        stored the source file is discarded and the existing object reused.
+        """
+        file_hash = file_hash or hash_file(src_path)
+        object_path = self.path_for(file_hash, extension)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+
+        with self._lock:
+            self._stats['puts'] += 1
+            held = self._refs.get(object_path)
+            if held is None:
+                fd = self._open_shared(object_path)
+                if fd is not None:
+                    held = self._refs[object_path] = [0, fd]
+            if held is not None:
+                held[0] += 1
+                self._stats['dedup_hits'] += 1
+                os.remove(src_path)
+                os.utime(object_path)
+                print(f"Deduplicated upload: {file_hash[:16]}... already stored")
+                return object_path, file_hash
+
+        # Stage next to the destination so the final rename is atomic, even if
+        # another worker is storing the same content concurrently. The lock is
+        # taken before the rename so the object is never visible unlocked.
+        staging_path = f"{object_path}.{uuid.uuid4().hex}.tmp"
+        shutil.move(src_path, staging_path)
+        fd = os.open(staging_path, os.O_RDONLY)
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+        size = os.fstat(fd).st_size
+        os.replace(staging_path, object_path)
+
+        with self._lock:
+            held = self._refs.get(object_path)
+            if held is None:
+                self._refs[object_path] = [1, fd]
+            else:
+                # A concurrent put of the same content renamed first; its inode
+                # is gone from the path, so keep the lock on ours
+                os.close(held[1])
+                held[0] += 1
+                held[1] = fd
+            self._stats['objects'] += 1
+            self._stats['bytes'] += size
+
+        print(f"Stored upload: {object_path}")
+        return object_path, file_hash
+
+    def _open_shared(self, path):
+        """Open and share-lock an existing object; None if it is missing or was just evicted"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+        # A janitor may have unlinked it between our open and lock
+        try:
+            current = os.stat(path).st_ino == os.fstat(fd).st_ino
+        except OSError:
+            current = False
+        if not current:
+            os.close(fd)
+            return None
+        return fd
+
+    def release(self, object_path):
+        """Drop a reference taken by ``put``"""
+        with self._lock:
+            held = self._refs.get(object_path)
+            if held is None:
+                return
+            held[0] -= 1
+            if held[0] <= 0:
+                del self._refs[object_path]
+                os.close(held[1])
+
+    def _scan(self):
+        """List (mtime, size, path) for every stored object"""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(prefix_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self, path):
+        """Remove an object unless some process holds it; returns whether it was removed"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return False
+        try:
+            if fcntl:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+            os.remove(path)
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+        return True
+
+    def evict(self):
+        """Run one janitor pass; returns the number of objects removed.
+
+        Only the set of objects in use is read under the lock; the directory
+        walk and the unlinks run outside it so puts are never held up. An
+        object that gets referenced after the snapshot is share-locked by
+        its put, which makes ``_evict`` skip it.
+        """
+        entries = sorted(self._scan())
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            in_use = set(self._refs)
+
+        kept = []
+        evicted = {'age': 0, 'quota': 0}
+        for mtime, size, path in entries:
+            if path not in in_use and mtime < cutoff and self._evict(path):
+                evicted['age'] += 1
+            else:
+                kept.append((mtime, size, path))
+
+        total_bytes = sum(size for _, size, _ in kept)
+        remaining = 0
+        for mtime, size, path in kept:
+            # Oldest first; objects in use anywhere are skipped, not counted as freed
+            if total_bytes > self.max_bytes and path not in in_use and self._evict(path):
+                total_bytes -= size
+                evicted['quota'] += 1
+            else:
+                remaining += 1
+
+        with self._lock:
+            self._stats['evictions_age'] += evicted['age']
+            self._stats['evictions_quota'] += evicted['quota']
+            self._stats['objects'] = remaining
+            self._stats['bytes'] = total_bytes
+            self._stats['janitor_runs'] += 1
+            self._stats['last_janitor_run'] = time.time()
+
+        removed = evicted['age'] + evicted['quota']
+        if removed:
+            print(f"Storage janitor evicted {removed} objects, {total_bytes} bytes remain")
+        return removed
+
+    def stats(self):
+        """Counters and gauges for the metrics endpoint"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['objects_in_use'] = len(self._refs)
+        stats['max_bytes'] = self.max_bytes
+        stats['max_age_seconds'] = self.max_age
+        return stats
+
+    def start_janitor(self, interval):
+        """Evict in a background thread every ``interval`` seconds"""
+        if self._janitor and self._janitor.is_alive():
+            return
+
+        def run():
+            while True:
+                try:
+                    self.evict()
+                except Exception as e:
+                    print(f"Storage janitor error: {e}")
+                if self._stop.wait(interval):
+                    return
+
+        self._stop.clear()
+        self._janitor = threading.Thread(target=run, name='storage-janitor', daemon=True)
+        self._janitor.start()
+
+    def stop_janitor(self):
+        self._stop.set()
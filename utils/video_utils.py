@@ -0,0 +1,202 @@
+import json
+import subprocess
+
+import numpy as np
+
+
+def probe_video(video_path):
+    """Width, height, fps, frame count, duration and start time of the first video stream"""
+    import ffmpeg
+
+    probe = ffmpeg.probe(video_path, select_streams='v:0')
+    if not probe.get('streams'):
+        raise ValueError(f"No video stream in {video_path}")
+    stream = probe['streams'][0]
+
+    num, _, den = stream.get('avg_frame_rate', '0/1').partition('/')
+    fps = float(num) / float(den or 1) if float(num) else 0.0
+    duration = float(stream.get('duration') or probe.get('format', {}).get('duration') or 0)
+    frame_count = int(stream.get('nb_frames') or 0) or int(round(duration * fps))
+    # Timestamps of MPEG-TS and trimmed MP4 files do not start at 0
+    start_time = stream.get('start_time') or probe.get('format', {}).get('start_time')
+
+    return {
+        'width': int(stream['width']),
+        'height': int(stream['height']),
+        'fps': fps,
+        'frame_count': frame_count,
+        'duration': duration,
+        'start_time': float(start_time) if start_time not in (None, 'N/A') else 0.0
+    }
+
+
+def list_keyframes(video_path, fps=None, start_time=None):
+    """Keyframes (I-frames) of the first video stream as (frame_index, timestamp) pairs.
+
+    Read from the packet flags in the container, so nothing is decoded.
+    Timestamps are relative to the stream's ``start_time``, so frame indices
+    count from the first frame as OpenCV and ffmpeg's ``select`` do.
+    """
+    if fps is None or start_time is None:
+        info = probe_video(video_path)
+        fps = info['fps'] if fps is None else fps
+        start_time = info['start_time'] if start_time is None else start_time
+
+    output = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', 'packet=pts_time,flags', '-of', 'json', video_path],
+        check=True, capture_output=True
+    ).stdout
+
+    keyframes = []
+    for packet in json.loads(output).get('packets', []):
+        if 'K' in packet.get('flags', '') and packet.get('pts_time') not in (None, 'N/A'):
+            timestamp = max(float(packet['pts_time']) - start_time, 0.0)
+            keyframes.append((int(round(timestamp * fps)), timestamp))
+    keyframes.sort()
+    return keyframes
+
+
+class FrameBuffer:
+    """Reusable (n, height, width, 3) uint8 array that frames are decoded into.
+
+    ``frames(n, height, width)`` returns a view of the first ``n`` slots and
+    only reallocates when the frame size changes or more slots are needed.
+    """
+
+    def __init__(self):
+        self._array = np.empty((0, 0, 0, 3), dtype=np.uint8)
+
+    def frames(self, count, height, width):
+        capacity, h, w, _ = self._array.shape
+        if (h, w) != (height, width):
+            capacity = 0
+        if count > capacity or capacity == 0:
+            self._array = np.empty((max(count, capacity, 1), height, width, 3), dtype=np.uint8)
+        return self._array[:count]
+
+
+def _check_frame_size(video_path, width, height):
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Cannot determine the frame size of {video_path}")
+
+
+def read_frames_seek(video_path, frame_indices, buffer=None, max_skip=8, info=None):
+    """Decode only the requested frames with OpenCV, seeking between them.
+
+    Frames at most ``max_skip`` ahead of the current position are reached by
+    grabbing forward, which is cheaper than seeking back to a keyframe.
+    Returns (indices, frames) for the frames that could be read, ``frames``
+    being a view into ``buffer``. When OpenCV cannot report the frame size,
+    it is taken from ``info`` or ffprobe.
+    """
+    import cv2
+
+    indices = sorted(set(frame_indices))
+    buffer = buffer or FrameBuffer()
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video {video_path}")
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if width <= 0 or height <= 0:
+            info = info or probe_video(video_path)
+            width, height = info['width'], info['height']
+        _check_frame_size(video_path, width, height)
+        frames = buffer.frames(len(indices), height, width)
+
+        position = 0
+        read = []
+        for index in indices:
+            if index < position or index - position > max_skip:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            else:
+                while position < index and cap.grab():
+                    position += 1
+            slot = frames[len(read)]
+            ok, image = cap.read(slot)
+            if not ok:
+                break
+            if not np.shares_memory(image, slot):
+                if image.shape != slot.shape:
+                    raise ValueError(f"Frame {index} is {image.shape[1]}x{image.shape[0]}, expected {width}x{height}")
+                slot[...] = image
+            read.append(index)
+            position = index + 1
+        return read, frames[:len(read)]
+    finally:
+        cap.release()
+
+
+def read_frames_ffmpeg(video_path, frame_indices=None, keyframes_only=False, buffer=None, info=None):
+    """Decode selected frames in a single ffmpeg pass into a reusable buffer.
+
+    ``frame_indices`` are kept with a ``select`` filter. With
+    ``keyframes_only`` the decoder skips every non-keyframe instead, so the
+    rest of the stream is never decoded. Returns a view of ``buffer`` with
+    one BGR frame per selected frame.
+    """
+    info = info or probe_video(video_path)
+    width, height = info['width'], info['height']
+    _check_frame_size(video_path, width, height)
+    buffer = buffer or FrameBuffer()
+
+    if keyframes_only:
+        expected = len(list_keyframes(video_path, info['fps'], info.get('start_time', 0.0)))
+        command = ['ffmpeg', '-v', 'error', '-skip_frame', 'nokey', '-i', video_path]
+    else:
+        indices = sorted(set(frame_indices))
+        expected = len(indices)
+        expression = '+'.join(f'eq(n\\,{i})' for i in indices)
+        command = ['ffmpeg', '-v', 'error', '-i', video_path, '-vf', f"select='{expression}'"]
+    command += ['-vsync', 'passthrough', '-f', 'rawvideo', '-pix_fmt', 'bgr24', 'pipe:']
+
+    frames = buffer.frames(expected, height, width)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    count = 0
+    try:
+        while count < expected:
+            view = memoryview(frames[count]).cast('B')
+            filled = 0
+            while filled < len(view):
+                n = process.stdout.readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
+            if filled < len(view):
+                break
+            count += 1
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+    return frames[:count]
+
+
+def has_audio_stream(video_path):
+    """Whether the container holds at least one audio stream"""
+    import ffmpeg
+
+    probe = ffmpeg.probe(video_path, select_streams='a')
+    return bool(probe.get('streams'))
+
+
+def extract_audio_track(video_path, output_path, sample_rate=16000):
+    """Demux the first audio stream to mono 16-bit PCM WAV.
+
+    Returns False when the video has no audio track.
+    """
+    import ffmpeg
+
+    if not has_audio_stream(video_path):
+        return False
+
+    (
+        ffmpeg
+        .input(video_path)
+        .output(output_path, vn=None, acodec='pcm_s16le', ac=1, ar=sample_rate)
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    return True
@@ -0,0 +1,16 @@
+"""WSGI entry point for production servers: gunicorn -c gunicorn.conf.py wsgi:app"""
+import gc
+import os
+
+from app.main import create_app
+from detection import model_loader
+
+# Background threads are started per worker (gunicorn.conf.py post_fork),
+# since threads do not survive fork and must not run in a preloading master
+app = create_app(background_tasks=False)
+
+if os.getenv('PRELOAD_MODELS', 'true').lower() == 'true':
+    model_loader.preload()
+    # Move everything loaded so far out of the GC's reach, so collections in
+    # the workers do not write to (and thereby copy) the shared pages
+    gc.freeze()